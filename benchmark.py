@@ -0,0 +1,340 @@
+"""Benchmarks for the Daily MS Work Order Log pipeline.
+
+Generates synthetic Time on Work Order exports and times the main stages of
+the pipeline on them: loading the workbook, preparing one day's report,
+laying out the largest craft's detail table pages and building the PDF.  Each
+stage is run once to warm up (imports, font and reference caches), timed over
+several repeats without memory tracing, and run once more under
+``tracemalloc`` for its peak memory; the median and fastest repeats are kept.
+The two PDF stages are skipped for workbooks above ``--pdf-max-rows``.  The
+results are printed and appended as JSON lines to a results file, so runs of
+different versions can be compared.
+
+Usage::
+
+    python benchmark.py
+    python benchmark.py --rows 1000 10000 --days 10 --label before-change
+    python benchmark.py --rows 10000 --repeat 7 --no-memory
+    python benchmark.py --rows 100000 --pdf-max-rows 100000
+    python benchmark.py --generate export.xlsx --rows 50000 --days 30
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+from workorder_export import (
+    ADDRESS_BOOK,
+    REQUIRED_TIME_COLUMNS,
+    TYPE_MAP,
+    Timings,
+    build_pdf,
+    get_address_book_df,
+    get_craft_order_df,
+    load_timeworkbook,
+    prepare_report_data,
+)
+from workorder_export.pdf import _create_detail_table_figures, _sort_detail_for_pdf
+
+DEFAULT_ROWS = [1000, 10000, 100000]
+DEFAULT_RESULTS = "benchmark_results.jsonl"
+DEFAULT_REPEAT = 3
+# Rendering the matplotlib PDF of a large workbook's busiest day takes minutes
+# per run, so by default the PDF stages only run on the smaller sizes.
+DEFAULT_PDF_MAX_ROWS = 10000
+
+# Vocabulary for the Description and Problem text.  Real exports carry long
+# free-text problem reports, which drive the detail table row heights.
+_WORDS = (
+    "replace inspect repair adjust lubricate align tighten weld fabricate install remove calibrate "
+    "pump motor gearbox bearing seal hose valve cylinder coupling conveyor crane hoist ladle "
+    "tundish mold roll guide panel breaker contactor transformer sensor limit switch encoder "
+    "hydraulic pneumatic cooling water leak vibration noise overheating tripped worn cracked "
+    "loose damaged stuck intermittent fault alarm north south east west upper lower drive side"
+).split()
+
+
+def _text(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=rng.randint(low, high))).capitalize()
+
+
+def generate_workbook(
+    path: str | os.PathLike | None,
+    rows: int,
+    days: int = 20,
+    start: date = date(2025, 1, 6),
+    unmapped_fraction: float = 0.02,
+    seed: int = 0,
+) -> bytes:
+    """Write a synthetic Time on Work Order export and return its bytes.
+
+    Rows are spread evenly over ``days`` Production Dates starting at
+    ``start``.  Each row books hours by an ``ADDRESS_BOOK`` employee to a
+    work order drawn from a shared pool, so crafts see repeated work orders
+    with a consistent Type, Description and Problem.  A small share of rows
+    use AddressBookNumbers missing from the address book, as real exports do.
+
+    :param path: File to write.  When None the workbook is only returned.
+    :param rows: Number of time entries.
+    :param unmapped_fraction: Share of rows booked by unknown employees.
+    :param seed: Random seed, so the same arguments give the same workbook.
+    """
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    employees = [(int(e["AddressBookNumber"]), e["Name"]) for e in ADDRESS_BOOK]
+    unknown = [(9000000 + i, f"CONTRACTOR, TEMP {i}") for i in range(5)]
+    type_codes = [int(code) if code.isdigit() else code for code in TYPE_MAP]
+    orders = [
+        {
+            "OrderNumber": 20000000 + i,
+            "Type": rng.choice(type_codes),
+            "Description": _text(rng, 3, 12),
+            "Problem": _text(rng, 0, 80) if rng.random() < 0.85 else None,
+            "Equipment": f"EQ-{rng.randint(100, 999)}",
+            "CostCenter": rng.choice([4100, 4200, 4300, 4400, 4500]),
+        }
+        for i in range(max(rows // 4, 1))
+    ]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Time on Work Order")
+    # Exports start with a title block above the header row.
+    ws.append(["Time on Work Order"])
+    ws.append([f"Generated {datetime.now():%m/%d/%Y %H:%M}"])
+    ws.append([])
+    ws.append(REQUIRED_TIME_COLUMNS)
+    for i in range(rows):
+        number, name = rng.choice(unknown if rng.random() < unmapped_fraction else employees)
+        order = rng.choice(orders)
+        production_date = datetime.combine(start + timedelta(days=i * days // rows), datetime.min.time())
+        row = {
+            "AddressBookNumber": number,
+            "Name": name,
+            "Production Date": production_date,
+            "OrderNumber": order["OrderNumber"],
+            "Sum of Hours.": rng.choice([0.25, 0.5, 1, 1.5, 2, 3, 4, 6, 8]),
+            "Hours Estimated": rng.choice([None, 1, 2, 4, 8]),
+            "Status": rng.choice(["Open", "In Progress", "Complete"]),
+            "Type": order["Type"],
+            "PMFrequency": None,
+            "Description": order["Description"],
+            "Problem": order["Problem"],
+            "Department": "Melt Shop",
+            "Location": "MS",
+            "Equipment": order["Equipment"],
+            "PM Number": None,
+            "PM": None,
+            "CostCenter": order["CostCenter"],
+        }
+        ws.append([row[col] for col in REQUIRED_TIME_COLUMNS])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    data = buffer.getvalue()
+    if path is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
+
+
+def _measure(fn: Callable[[], Any], trace_memory: bool, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Run ``fn`` once to warm up, ``repeat`` times for its median and fastest
+    time and, if asked, once more for its peak memory."""
+    result = fn()
+    seconds = []
+    for _ in range(max(repeat, 1)):
+        with Timings() as timed:
+            fn()
+        seconds.append(timed.total_ms / 1000.0)
+    measured = {
+        "result": result,
+        "seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "peak_bytes": None,
+    }
+    if trace_memory:
+        with Timings(trace_memory=True) as traced:
+            fn()
+        measured["peak_bytes"] = traced.peak_bytes
+    return measured
+
+
+def run_benchmarks(
+    rows: List[int],
+    days: int = 20,
+    trace_memory: bool = True,
+    label: str = "",
+    seed: int = 0,
+    repeat: int = DEFAULT_REPEAT,
+    pdf_max_rows: int | None = DEFAULT_PDF_MAX_ROWS,
+) -> List[Dict[str, Any]]:
+    """Time each pipeline stage on a synthetic workbook of each size.
+
+    The report stages use the busiest Production Date; the detail table
+    stage lays out that day's largest craft.  ``seconds`` is the median of
+    ``repeat`` timed runs after a warm-up run.
+
+    :param pdf_max_rows: Largest workbook the detail table and PDF stages
+        are run for, or None for every size.
+
+    :return: One result dictionary per size and stage.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in rows:
+            path = os.path.join(tmp, f"synthetic_{n}.xlsx")
+            generate_workbook(path, n, days=days, seed=seed)
+
+            def load() -> pd.DataFrame:
+                with open(path, "rb") as f:
+                    return load_timeworkbook(f)
+
+            stages: Dict[str, Dict[str, Any]] = {}
+            stages["load_timeworkbook"] = _measure(load, trace_memory, repeat)
+            time_df = stages["load_timeworkbook"]["result"]
+            busiest = time_df["Production Date"].value_counts().idxmax()
+            day_rows = int((time_df["Production Date"] == busiest).sum())
+
+            def prepare() -> Dict[str, Any]:
+                return prepare_report_data(time_df, get_address_book_df(), get_craft_order_df(), busiest)
+
+            stages["prepare_report_data"] = _measure(prepare, trace_memory, repeat)
+            report = stages["prepare_report_data"]["result"]
+            craft_name, payload = max(report["groups"], key=lambda group: len(group[1]["detail"]))
+            df_sorted = _sort_detail_for_pdf(payload["detail"], "Name")
+
+            def layout() -> int:
+                figures = _create_detail_table_figures(df_sorted, craft_name)
+                for fig in figures:
+                    plt.close(fig)
+                return len(figures)
+
+            if pdf_max_rows is None or n <= pdf_max_rows:
+                stages["_create_detail_table_figures"] = _measure(layout, trace_memory, repeat)
+                label_date = f"{busiest:%m/%d/%Y}"
+                stages["build_pdf"] = _measure(lambda: build_pdf(report, label_date), trace_memory, repeat)
+            else:
+                print(f"Skipping the PDF stages for {n} rows (over --pdf-max-rows)", file=sys.stderr)
+
+            stage_rows = {
+                "load_timeworkbook": n,
+                "prepare_report_data": day_rows,
+                "_create_detail_table_figures": len(df_sorted),
+                "build_pdf": day_rows,
+            }
+            for stage, measured in stages.items():
+                seconds = measured["seconds"]
+                results.append(
+                    {
+                        "label": label,
+                        "ts": time.time(),
+                        "python": platform.python_version(),
+                        "pandas": pd.__version__,
+                        "workbook_rows": n,
+                        "days": days,
+                        "stage": stage,
+                        "rows": stage_rows[stage],
+                        "repeat": max(repeat, 1),
+                        "seconds": round(seconds, 4),
+                        "min_seconds": round(measured["min_seconds"], 4),
+                        "rows_per_s": round(stage_rows[stage] / seconds, 1) if seconds > 0 else None,
+                        "peak_bytes": measured["peak_bytes"],
+                    }
+                )
+    return results
+
+
+def _previous_results(path: str, label: str) -> Dict[tuple, Dict[str, Any]]:
+    """Return the latest earlier result for each (rows, days, stage) with a
+    different label, to compare the new run against."""
+    previous: Dict[tuple, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return previous
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("label") != label:
+                previous[(record.get("workbook_rows"), record.get("days"), record.get("stage"))] = record
+    return previous
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Daily MS Work Order Log pipeline.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Workbook sizes in rows")
+    parser.add_argument("--days", type=int, default=20, help="Production Dates the rows are spread over")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic workbooks")
+    parser.add_argument("--label", default="", help="Name of this run in the results file, e.g. a git revision")
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage after a warm-up; the median is kept"
+    )
+    parser.add_argument(
+        "--pdf-max-rows",
+        type=int,
+        default=DEFAULT_PDF_MAX_ROWS,
+        help="Only run the detail table and PDF stages for workbooks up to this many rows",
+    )
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSON lines file the results are appended to")
+    parser.add_argument(
+        "--memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Run each stage a second time under tracemalloc to record peak memory",
+    )
+    parser.add_argument("--generate", metavar="PATH", help="Only write a synthetic workbook of --rows[0] rows to PATH")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        generate_workbook(args.generate, args.rows[0], days=args.days, seed=args.seed)
+        print(args.generate)
+        return 0
+
+    previous = _previous_results(args.results, args.label)
+    results = run_benchmarks(
+        args.rows,
+        days=args.days,
+        trace_memory=args.memory,
+        label=args.label,
+        seed=args.seed,
+        repeat=args.repeat,
+        pdf_max_rows=args.pdf_max_rows,
+    )
+    with open(args.results, "a", encoding="utf-8") as f:
+        for record in results:
+            f.write(json.dumps(record) + "\n")
+
+    print(f"{'rows':>8}  {'stage':<30} {'seconds':>9} {'min':>9} {'rows/s':>11} {'peak MB':>8}  change")
+    for record in results:
+        peak = record["peak_bytes"]
+        before = previous.get((record["workbook_rows"], record["days"], record["stage"]))
+        change = ""
+        if before and before.get("seconds"):
+            change = f"{record['seconds'] / before['seconds'] - 1:+.0%} vs {before.get('label') or 'previous'}"
+        print(
+            f"{record['workbook_rows']:>8}  {record['stage']:<30} {record['seconds']:>9.3f} "
+            f"{record['min_seconds']:>9.3f} {record['rows_per_s'] or 0:>11,.0f} "
+            f"{'' if peak is None else f'{peak / 1e6:.1f}':>8}  {change}"
+        )
+    print(f"Results appended to {args.results}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""Headless batch exporter for the Daily MS Work Order Log.
+
+Renders one PDF snapshot per Production Date in a Time on Work Order export
+without going through the Streamlit UI.  The workbook is parsed and indexed
+once, and the dates are rendered in parallel worker processes.
+
+Usage::
+
+    python export_pdfs.py export.xlsx --out pdfs/
+    python export_pdfs.py export.xlsx --out pdfs/ --start 2025-01-01 --end 2025-01-31 --backend reportlab
+    python export_pdfs.py export.xlsx --out pdfs/ --store pdfs/history.arrow
+    python export_pdfs.py export.xlsx --out pdfs/ --start 2025-01-01 --end 2025-01-14 --range
+    python export_pdfs.py export.xlsx --out pdfs/ --reference reference.json
+    python export_pdfs.py export.xlsx --out pdfs/ --history history.sqlite
+    python export_pdfs.py export.xlsx --out pdfs/ --workers 1 --craft-workers 4
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from workorder_export import (
+    PDF_BACKENDS,
+    FrameCache,
+    HistoryStore,
+    IncrementalStore,
+    apply_reference_data,
+    build_pdf,
+    compact_time_frame,
+    default_history_path,
+    default_reference_path,
+    get_address_book_df,
+    get_craft_order_df,
+    index_time_data,
+    load_timeworkbook_cached,
+    load_reference_data,
+    load_timeworkbook_streaming,
+    prepare_range_report,
+    prepare_report_data,
+)
+
+SORT_OPTIONS = {"name": "Name", "work-order": "Work Order # (descending)"}
+
+# Set in each worker process by ``_init_worker`` so the indexed time data is
+# sent once per worker rather than once per date.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    index: Dict[str, Any],
+    out_dir: str,
+    sort_option: str,
+    backend: str,
+    reference: Dict[str, Any] | None = None,
+    craft_workers: int = 1,
+) -> None:
+    """Keep the shared export settings in the worker and select the Agg backend.
+
+    ``reference`` is the reference data loaded by the parent, installed again
+    here for workers that were spawned rather than forked."""
+    if reference is not None:
+        apply_reference_data(reference)
+    if backend == "matplotlib":
+        import matplotlib
+
+        matplotlib.use("Agg")
+    _worker_state.update(
+        index=index, out_dir=out_dir, sort_option=sort_option, backend=backend, craft_workers=craft_workers
+    )
+
+
+def _export_date(selected_date: date) -> str:
+    """Prepare and render the report for one date and return the written path."""
+    state = _worker_state
+    report = prepare_report_data(
+        state["index"]["frame"],
+        get_address_book_df(),
+        get_craft_order_df(),
+        selected_date,
+        index=state["index"],
+    )
+    label = datetime.strftime(pd.to_datetime(selected_date), "%m/%d/%Y")
+    pdf_bytes = build_pdf(
+        report, label, state["sort_option"], workers=state["craft_workers"], backend=state["backend"]
+    )
+    path = os.path.join(state["out_dir"], f"workorder_snapshot_{label.replace('/', '-')}.pdf")
+    with open(path, "wb") as f:
+        f.write(pdf_bytes)
+    return path
+
+
+def export_pdfs(
+    workbook: str,
+    out_dir: str,
+    start: date | None = None,
+    end: date | None = None,
+    sort_option: str = "Name",
+    backend: str = "matplotlib",
+    workers: int | None = None,
+    cache_dir: str | None = None,
+    store_path: str | None = None,
+    compact: bool = False,
+    range_report: bool = False,
+    reference_path: str | None = None,
+    history_path: str | None = None,
+    craft_workers: int = 1,
+) -> List[str]:
+    """Write one PDF per Production Date in ``workbook`` to ``out_dir``.
+
+    :param start: First date to export (inclusive).  Defaults to the earliest date.
+    :param end: Last date to export (inclusive).  Defaults to the latest date.
+    :param workers: Number of worker processes.  Defaults to the CPU count;
+        1 renders every date in this process.
+    :param cache_dir: Directory of the on-disk cache of cleaned workbooks.
+        When None the workbook is always parsed.
+    :param store_path: Arrow file of an ``IncrementalStore``.  When given, the
+        workbook is merged into the store and only the dates it adds or
+        changes are exported.
+    :param compact: Convert the time data to the compact schema before
+        indexing, to cut memory on long date ranges.
+    :param range_report: Write a single rollup PDF covering the exported
+        dates instead of one PDF per date.
+    :param reference_path: Reference data file (address book, craft order and
+        type mappings) used instead of the built-in tables.
+    :param history_path: SQLite history database the workbook's rows are
+        saved to (see ``HistoryStore``).
+    :param craft_workers: Processes used to draw the craft sections of each
+        PDF (``build_pdf(workers=...)``).  Each date worker starts its own,
+        so keep ``workers * craft_workers`` near the CPU count.
+    :return: The written file paths in date order.
+    """
+    reference = load_reference_data(reference_path) if reference_path else None
+    if reference is not None:
+        apply_reference_data(reference)
+    if cache_dir:
+        with open(workbook, "rb") as f:
+            data = f.read()
+        time_df = load_timeworkbook_cached(data, FrameCache(cache_dir))
+    else:
+        # Without a cache the workbook is streamed from disk and rows outside
+        # the requested dates are dropped as they are read.
+        time_df = load_timeworkbook_streaming(workbook, start=start, end=end)
+    if history_path:
+        saved = HistoryStore(history_path).save(time_df)
+        print(
+            f"History: {len(saved['added'])} new and {len(saved['updated'])} updated date(s) saved",
+            file=sys.stderr,
+        )
+    if compact:
+        compacted = compact_time_frame(time_df)
+        time_df = compacted["frame"]
+        print(
+            f"Time data memory: {compacted['bytes_before'] / 1e6:,.1f} MB -> {compacted['bytes_after'] / 1e6:,.1f} MB",
+            file=sys.stderr,
+        )
+    index = index_time_data(time_df, get_address_book_df())
+    dates = sorted(d for d in index["date_rows"] if pd.notna(d))
+    dates = [d for d in dates if (start is None or d >= start) and (end is None or d <= end)]
+    if store_path:
+        store = IncrementalStore.load(store_path)
+        changes = store.merge(time_df)
+        store.save(store_path)
+        print(
+            f"{len(changes['added'])} new, {len(changes['updated'])} updated, "
+            f"{len(changes['unchanged'])} unchanged date(s)",
+            file=sys.stderr,
+        )
+        changed = set(changes["added"]) | set(changes["updated"])
+        dates = [d for d in dates if d in changed]
+    os.makedirs(out_dir, exist_ok=True)
+    if not dates:
+        return []
+    if range_report:
+        first, last = dates[0], dates[-1]
+        report = prepare_range_report(time_df, get_address_book_df(), get_craft_order_df(), first, last, index=index)
+        if backend == "matplotlib":
+            import matplotlib
+
+            matplotlib.use("Agg")
+        pdf_bytes = build_pdf(
+            report, f"{first:%m/%d/%Y} - {last:%m/%d/%Y}", sort_option, workers=craft_workers, backend=backend
+        )
+        path = os.path.join(out_dir, f"workorder_range_{first:%m-%d-%Y}_{last:%m-%d-%Y}.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf_bytes)
+        return [path]
+    workers = min(workers or os.cpu_count() or 1, len(dates))
+    init_args = (index, out_dir, sort_option, backend, reference, craft_workers)
+    if workers <= 1:
+        _init_worker(*init_args)
+        return [_export_date(d) for d in dates]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        return list(pool.map(_export_date, dates))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export one Daily MS Work Order Log PDF per Production Date.")
+    parser.add_argument("workbook", help="Time on Work Order export (.xlsx)")
+    parser.add_argument("--out", required=True, help="Directory to write the PDFs to")
+    parser.add_argument("--start", type=date.fromisoformat, help="First date to export, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last date to export, YYYY-MM-DD")
+    parser.add_argument("--sort", choices=sorted(SORT_OPTIONS), default="name", help="Detail table sort order")
+    parser.add_argument("--backend", choices=PDF_BACKENDS, default="matplotlib", help="PDF engine")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--craft-workers",
+        type=int,
+        default=1,
+        help="Processes drawing the craft sections of each PDF (matplotlib backend only)",
+    )
+    parser.add_argument("--cache-dir", help="Reuse cleaned workbooks cached in this directory")
+    parser.add_argument("--compact", action="store_true", help="Use the compact in-memory schema")
+    parser.add_argument("--range", action="store_true", help="Write one rollup PDF for the whole date range")
+    parser.add_argument(
+        "--history",
+        default=default_history_path(),
+        help="Also save the workbook's rows to this SQLite history database (default: $WORKORDER_EXPORT_HISTORY)",
+    )
+    parser.add_argument(
+        "--reference",
+        default=default_reference_path(),
+        help="Address book / craft order / type mapping file (.json, .csv or .sqlite; "
+        "default: $WORKORDER_EXPORT_REFERENCE)",
+    )
+    parser.add_argument(
+        "--store", help="Merge into this incremental store file and export only new or changed dates"
+    )
+    args = parser.parse_args(argv)
+
+    paths = export_pdfs(
+        args.workbook,
+        args.out,
+        start=args.start,
+        end=args.end,
+        sort_option=SORT_OPTIONS[args.sort],
+        backend=args.backend,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        store_path=args.store,
+        compact=args.compact,
+        range_report=args.range,
+        reference_path=args.reference,
+        history_path=args.history,
+        craft_workers=args.craft_workers,
+    )
+    if not paths:
+        if args.store:
+            print("No new or changed Production Dates in the selected range.", file=sys.stderr)
+            return 0
+        print("No Production Dates found in the selected range.", file=sys.stderr)
+        return 1
+    for path in paths:
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
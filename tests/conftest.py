@@ -0,0 +1,62 @@
+"""Shared fixtures: a small cleaned Time on Work Order export."""
+import io
+import random
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from workorder_export import ADDRESS_BOOK, REQUIRED_TIME_COLUMNS, load_timeworkbook
+
+EXPORT_START = date(2025, 1, 6)
+EXPORT_DAYS = 3
+
+
+def export_workbook(rows: int = 240, days: int = EXPORT_DAYS, seed: int = 0) -> bytes:
+    """Return an export of ``rows`` entries by address book employees (and a
+    few unknown ones) spread over ``days`` Production Dates."""
+    rng = random.Random(seed)
+    people = [(int(e["AddressBookNumber"]), e["Name"]) for e in ADDRESS_BOOK[:12]] + [(9000001, "CONTRACTOR, TEMP")]
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Time on Work Order"])
+    ws.append([])
+    ws.append(REQUIRED_TIME_COLUMNS)
+    for i in range(rows):
+        number, name = rng.choice(people)
+        order = rng.randrange(12)
+        values = {
+            "AddressBookNumber": number,
+            "Name": name,
+            "Production Date": datetime.combine(EXPORT_START + timedelta(days=i % days), datetime.min.time()),
+            "OrderNumber": 20000000 + order,
+            "Sum of Hours.": rng.choice([0.25, 0.5, 1, 2, 4, 8]),
+            "Hours Estimated": rng.choice([None, 2, 4]),
+            "Status": rng.choice(["Open", "Complete"]),
+            "Type": [0, 1, 4, 5, 7, "P", "C", None, 2, "7", 6, 9][order],
+            "PMFrequency": None,
+            "Description": f"Work order {order} description",
+            "Problem": rng.choice([None, "Leaking seal", "Motor tripped on overload"]),
+            "Department": "Melt Shop",
+            "Location": "MS",
+            "Equipment": f"EQ-{order}",
+            "PM Number": None,
+            "PM": None,
+            "CostCenter": rng.choice([4100, 4200]),
+        }
+        ws.append([values[col] for col in REQUIRED_TIME_COLUMNS])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def export_bytes() -> bytes:
+    return export_workbook()
+
+
+@pytest.fixture
+def time_df(export_bytes) -> pd.DataFrame:
+    """A freshly loaded cleaned time frame (tests may modify it)."""
+    return load_timeworkbook(io.BytesIO(export_bytes))
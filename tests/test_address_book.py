@@ -0,0 +1,67 @@
+"""Tests for the compiled address book lookup."""
+import numpy as np
+import pandas as pd
+
+from workorder_export import compile_address_book, get_address_book_df, index_time_data
+from workorder_export.data import _ADDRESS_BOOK_LOOKUP_LIMIT, _address_book_positions
+
+
+def _book(rows):
+    return pd.DataFrame(rows, columns=["AddressBookNumber", "Name", "Craft Description"])
+
+
+def test_lookup_is_cached_per_content():
+    book = get_address_book_df()
+
+    first = compile_address_book(book)
+
+    assert compile_address_book(book.copy()) is first
+    changed = book.copy()
+    changed.loc[changed.index[0], "Craft Description"] = "Segment Shop"
+    assert compile_address_book(changed) is not first
+    assert compile_address_book(changed)["digest"] != first["digest"]
+
+
+def test_cache_is_bounded():
+    lookups = [compile_address_book(_book([(str(i), f"PERSON {i}", "MS Turns")])) for i in range(20)]
+
+    assert compile_address_book(_book([("19", "PERSON 19", "MS Turns")])) is lookups[-1]
+    assert compile_address_book(_book([("0", "PERSON 0", "MS Turns")])) is not lookups[0]
+    assert _ADDRESS_BOOK_LOOKUP_LIMIT < 20
+
+
+def test_entries_are_stripped_and_first_number_wins():
+    lookup = compile_address_book(
+        _book([(" 100 ", "ONE ", " MS Turns"), ("100", "DUPLICATE", "Segment Shop"), ("200", "TWO", "  ")])
+    )
+
+    positions = _address_book_positions(pd.Series(["100", "200", "300"]), lookup)
+
+    assert list(lookup["numbers"]) == ["100", "200"]
+    assert lookup["crafts"].take(positions).tolist()[0] == "MS Turns"
+    assert lookup["names"].take(positions).tolist()[:2] == ["ONE", "TWO"]
+    # An empty craft and an unknown number both have no craft.
+    assert pd.isna(lookup["crafts"].take(positions)[1:]).all()
+
+
+def test_categorical_numbers_give_the_same_positions(time_df):
+    lookup = compile_address_book(get_address_book_df())
+    numbers = time_df["AddressBookNumber"].copy()
+    numbers.iloc[0] = np.nan
+
+    positions = _address_book_positions(numbers.astype("category"), lookup)
+
+    expected = _address_book_positions(numbers, lookup)
+    np.testing.assert_array_equal(positions, expected)
+    assert positions[0] == -1
+
+
+def test_index_matches_joining_the_address_book(time_df):
+    book = get_address_book_df()
+
+    index = index_time_data(time_df, book)
+
+    joined = time_df.merge(book, on="AddressBookNumber", how="left", suffixes=("", "_book"))
+    assert index["frame"]["Craft Description"].fillna("").tolist() == joined["Craft Description"].fillna("").tolist()
+    np.testing.assert_array_equal(index["unmapped"], joined["Craft Description"].isna().to_numpy())
+    assert index["frame"]["Name"].tolist() == joined["Name"].fillna(joined["Name_book"]).tolist()
@@ -0,0 +1,67 @@
+"""Tests for the on-disk Arrow cache of cleaned frames."""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from workorder_export import date_digests, get_address_book_df, get_craft_order_df, prepare_report_data
+from workorder_export.cache import read_arrow, write_arrow
+
+pytest.importorskip("pyarrow")
+
+
+def test_concurrent_writes_of_one_path(time_df, tmp_path):
+    path = tmp_path / "frame.arrow"
+    errors = []
+
+    def write_and_read():
+        try:
+            for _ in range(5):
+                write_arrow(path, time_df)
+                assert len(read_arrow(path)) == len(time_df)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write_and_read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["frame.arrow"]
+
+
+def test_round_trip_keeps_values_except_mixed_types_as_text(time_df, tmp_path):
+    # ``Type`` mixes int codes with letters and numeric strings.
+    assert {type(v) for v in time_df["Type"].dropna()} == {int, str}
+    path = tmp_path / "frame.arrow"
+    write_arrow(path, time_df)
+
+    cached = read_arrow(path)
+
+    assert list(cached.columns) == list(time_df.columns)
+    for col in time_df.columns:
+        if col == "Type":
+            continue
+        pd.testing.assert_series_equal(cached[col], time_df[col], check_dtype=False)
+    # Mixed-type columns come back as strings, with their missing values intact.
+    expected_type = time_df["Type"].astype(str).where(time_df["Type"].notna(), np.nan)
+    pd.testing.assert_series_equal(cached["Type"], expected_type)
+    assert {type(v) for v in cached["Type"].dropna()} == {str}
+
+
+def test_cached_frame_gives_the_same_digests_and_reports(time_df, tmp_path):
+    path = tmp_path / "frame.arrow"
+    write_arrow(path, time_df)
+    cached = read_arrow(path)
+
+    assert date_digests(cached) == date_digests(time_df)
+    for day in sorted(time_df["Production Date"].unique()):
+        expected = prepare_report_data(time_df, get_address_book_df(), get_craft_order_df(), day)
+        result = prepare_report_data(cached, get_address_book_df(), get_craft_order_df(), day)
+        assert [name for name, _ in result["groups"]] == [name for name, _ in expected["groups"]]
+        for (_, payload), (_, expected_payload) in zip(result["groups"], expected["groups"]):
+            pd.testing.assert_frame_equal(payload["detail"], expected_payload["detail"])
+        pd.testing.assert_frame_equal(result["full_detail"], expected["full_detail"])
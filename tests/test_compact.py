@@ -0,0 +1,71 @@
+"""Tests for the compact in-memory schema."""
+import numpy as np
+import pandas as pd
+
+from workorder_export import (
+    IncrementalStore,
+    compact_time_frame,
+    get_address_book_df,
+    get_craft_order_df,
+    prepare_report_data,
+)
+from workorder_export.data import COMPACT_CATEGORY_COLUMNS
+
+
+def test_compact_schema(time_df):
+    original = time_df.copy()
+
+    result = compact_time_frame(time_df)
+
+    frame = result["frame"]
+    pd.testing.assert_frame_equal(time_df, original)
+    for col in COMPACT_CATEGORY_COLUMNS:
+        assert isinstance(frame[col].dtype, pd.CategoricalDtype), col
+    assert pd.api.types.is_datetime64_any_dtype(frame["Production Date"])
+    assert frame["Sum of Hours"].dtype == np.float32
+    assert result["bytes_after"] < result["bytes_before"]
+
+
+def test_compact_keeps_values(time_df):
+    time_df.loc[time_df.index[:3], "OrderNumber"] = np.nan
+    time_df["Work Order #"] = time_df["OrderNumber"].astype(str).str.replace(r"\.0$", "", regex=True)
+
+    frame = compact_time_frame(time_df)["frame"]
+
+    assert frame["Work Order #"].isna().sum() == 3
+    assert (frame["Work Order #"].dropna() == time_df["Work Order #"].iloc[3:]).all()
+    # Mixed int and str codes are stored as their text.
+    expected_type = time_df["Type"].astype(str).where(time_df["Type"].notna(), np.nan)
+    assert frame["Type"].astype(object).equals(expected_type)
+    assert (frame["Production Date"].dt.date == time_df["Production Date"]).all()
+    np.testing.assert_allclose(frame["Sum of Hours"], time_df["Sum of Hours"])
+
+
+def test_compact_reports_match(time_df):
+    compact = compact_time_frame(time_df)["frame"]
+
+    for day in sorted(time_df["Production Date"].unique()):
+        expected = prepare_report_data(time_df, get_address_book_df(), get_craft_order_df(), day)
+        result = prepare_report_data(compact, get_address_book_df(), get_craft_order_df(), day)
+        assert [name for name, _ in result["groups"]] == [name for name, _ in expected["groups"]]
+        for (_, payload), (_, expected_payload) in zip(result["groups"], expected["groups"]):
+            pd.testing.assert_frame_equal(
+                payload["detail"].astype(str).reset_index(drop=True),
+                expected_payload["detail"].astype(str).reset_index(drop=True),
+            )
+
+
+def test_store_mixes_compact_and_default_merges(time_df):
+    first, second, third = sorted(time_df["Production Date"].unique())
+    store = IncrementalStore()
+    store.merge(time_df[time_df["Production Date"].isin([first, second])])
+    corrected = time_df[time_df["Production Date"] == third].copy()
+    corrected["Sum of Hours"] *= 2
+
+    # Compact mode switched on mid-session, then off again.
+    assert store.merge(compact_time_frame(corrected)["frame"])["added"] == [third]
+    assert store.merge(time_df)["updated"] == [third]
+
+    assert len(store.frame) == len(time_df)
+    assert {type(d) for d in store.frame["Production Date"]} == {type(first)}
+    assert store.frame["Sum of Hours"].sum() == time_df["Sum of Hours"].sum()
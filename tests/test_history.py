@@ -0,0 +1,115 @@
+"""Tests for the SQLite history store."""
+import datetime
+import decimal
+
+import pandas as pd
+import pytest
+
+from workorder_export import (
+    HistoryStore,
+    date_digests,
+    get_address_book_df,
+    get_craft_order_df,
+    prepare_report_data,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(tmp_path / "history.sqlite")
+
+
+def _days(df):
+    return sorted(df["Production Date"].unique())
+
+
+def _numbers(df):
+    return sorted(df["AddressBookNumber"].unique())
+
+
+def test_crafts_follow_the_current_address_book(store, time_df):
+    store.save(time_df)
+    book = get_address_book_df()
+    person = book.iloc[0]
+    moved = book.copy()
+    moved.loc[moved.index[0], "Craft Description"] = "Segment Shop"
+
+    before = store.query(crafts=[person["Craft Description"]])
+    after = store.query(crafts=["Segment Shop"], addr_df=moved)
+
+    assert person["AddressBookNumber"] in _numbers(before)
+    assert person["AddressBookNumber"] in _numbers(after)
+    assert person["AddressBookNumber"] not in _numbers(store.query(crafts=[person["Craft Description"]], addr_df=moved))
+    assert (after["Craft Description"] == "Segment Shop").all()
+
+
+def test_craft_filter_matches_assigned_crafts(store, time_df):
+    store.save(time_df)
+    everything = store.query()
+
+    for craft in everything["Craft Description"].unique():
+        result = store.query(crafts=[craft])
+        expected = everything[everything["Craft Description"] == craft].reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected)
+    assert "Unassigned" in set(everything["Craft Description"])
+    missing = store.query(crafts=["No Such Craft"])
+    assert missing.empty and list(missing.columns) == list(everything.columns)
+
+
+def test_save_replaces_changed_dates_only(store, time_df):
+    first, second, third = _days(time_df)
+
+    assert store.save(time_df) == {"added": [first, second, third], "updated": [], "unchanged": []}
+    version = store.version
+    assert store.save(time_df) == {"added": [], "updated": [], "unchanged": [first, second, third]}
+    assert store.version == version
+
+    corrected = time_df[time_df["Production Date"] == second].copy()
+    corrected["Sum of Hours"] += 1
+    assert store.save(corrected) == {"added": [], "updated": [second], "unchanged": []}
+
+    assert store.version != version
+    loaded = store.load()
+    assert len(loaded) == len(time_df)
+    expected = time_df["Sum of Hours"].sum() + len(corrected)
+    assert loaded["Sum of Hours"].sum() == pytest.approx(expected)
+
+
+def test_load_gives_back_the_cleaned_frame(store, time_df):
+    store.save(time_df)
+
+    loaded = HistoryStore(store.path).load()
+
+    assert store.dates() == _days(time_df)
+    assert date_digests(loaded) == date_digests(time_df)
+    assert sorted(loaded.columns) == sorted(time_df.columns)
+    for day in _days(time_df):
+        expected = prepare_report_data(time_df, get_address_book_df(), get_craft_order_df(), day)
+        result = prepare_report_data(loaded, get_address_book_df(), get_craft_order_df(), day)
+        pd.testing.assert_frame_equal(result["full_detail"], expected["full_detail"])
+
+
+def test_query_filters(store, time_df):
+    store.save(time_df)
+    first, second, third = _days(time_df)
+    person = time_df["AddressBookNumber"].iloc[0]
+    work_order = time_df["Work Order #"].iloc[0]
+
+    assert _days(store.query(start=second)) == [second, third]
+    assert _days(store.query(end=first)) == [first]
+    assert _numbers(store.query(address_book_numbers=[person])) == [person]
+    by_work_order = store.query(work_orders=[work_order], start=second, end=second)
+    expected = time_df[(time_df["Work Order #"] == work_order) & (time_df["Production Date"] == second)]
+    assert len(by_work_order) == len(expected)
+    assert store.query(address_book_numbers=[]).empty
+
+
+def test_values_sqlite_cannot_bind_are_stored_as_text(store, time_df):
+    time_df["Shift Start"] = datetime.time(6, 30)
+    time_df["Rate"] = decimal.Decimal("1.5")
+
+    store.save(time_df)
+
+    loaded = store.load()
+    assert set(loaded["Shift Start"]) == {"06:30:00"}
+    assert set(loaded["Rate"]) == {"1.5"}
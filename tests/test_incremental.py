@@ -0,0 +1,77 @@
+"""Tests for merging overlapping exports into an IncrementalStore."""
+import pandas as pd
+import pytest
+
+from workorder_export import IncrementalStore, date_digests
+
+
+def _days(df):
+    return sorted(df["Production Date"].unique())
+
+
+def _on(df, days):
+    return df[df["Production Date"].isin(days)].reset_index(drop=True)
+
+
+def test_merge_reports_added_updated_and_unchanged_dates(time_df):
+    first, second, third = _days(time_df)
+    store = IncrementalStore()
+
+    assert store.merge(_on(time_df, [first, second])) == {"added": [first, second], "updated": [], "unchanged": []}
+
+    # The next export repeats the second day with a correction and adds the third.
+    rolled = _on(time_df, [second, third])
+    rolled.loc[rolled["Production Date"] == second, "Sum of Hours"] += 1
+    assert store.merge(rolled) == {"added": [third], "updated": [second], "unchanged": []}
+
+    assert store.merge(rolled) == {"added": [], "updated": [], "unchanged": [second, third]}
+
+
+def test_merged_store_holds_each_date_once(time_df):
+    first, second, third = _days(time_df)
+    store = IncrementalStore()
+    store.merge(_on(time_df, [first, second]))
+    rolled = _on(time_df, [second, third])
+    rolled.loc[rolled["Production Date"] == second, "Sum of Hours"] += 1
+    store.merge(rolled)
+
+    hours = store.frame.groupby("Production Date")["Sum of Hours"].sum()
+    expected = time_df.groupby("Production Date")["Sum of Hours"].sum()
+    expected[second] += (time_df["Production Date"] == second).sum()
+    pd.testing.assert_series_equal(hours, expected)
+    # Dates only in the store are kept.
+    assert _days(store.frame) == [first, second, third]
+    assert store.digests == date_digests(store.frame)
+
+
+def test_version_changes_only_with_the_contents(time_df):
+    store = IncrementalStore()
+    empty = store.version
+    store.merge(time_df)
+    merged = store.version
+
+    store.merge(time_df)
+
+    assert empty != merged
+    assert store.version == merged
+
+
+def test_digests_do_not_depend_on_row_order(time_df):
+    shuffled = time_df.sample(frac=1, random_state=0)
+
+    assert date_digests(shuffled) == date_digests(time_df)
+
+
+def test_save_and_load_round_trip(time_df, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "store.arrow"
+    store = IncrementalStore()
+    store.merge(time_df)
+    store.save(path)
+
+    loaded = IncrementalStore.load(path)
+
+    assert loaded.digests == store.digests
+    assert loaded.version == store.version
+    assert loaded.merge(time_df)["unchanged"] == _days(time_df)
+    assert IncrementalStore.load(tmp_path / "missing.arrow").frame.empty
@@ -0,0 +1,101 @@
+"""Regression tests for the Time on Work Order loaders.
+
+Both loaders must give the same frame as the original path: locate the
+header row, read the sheet again with ``pd.read_excel(header=row)`` and clean
+the result.
+"""
+import io
+import random
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from workorder_export import REQUIRED_TIME_COLUMNS, load_timeworkbook, load_timeworkbook_streaming
+from workorder_export.data import _clean_time_frame, _find_header_row
+
+START = date(2025, 1, 6)
+
+
+def make_workbook(rows: int, days: int = 3, preamble: int = 3, blank_every: int = 0, seed: int = 0) -> bytes:
+    """Return an export with ``preamble`` title rows above the header, mixed
+    Type codes, numbers stored as text and the NA strings pandas recognizes."""
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    for i in range(preamble):
+        ws.append(["Time on Work Order"] if i == 0 else [])
+    ws.append(REQUIRED_TIME_COLUMNS)
+    for i in range(rows):
+        if blank_every and i and i % blank_every == 0:
+            ws.append([])
+        values = {
+            "AddressBookNumber": rng.choice([1103079, "817150", " 648991 ", 9000001]),
+            "Name": rng.choice(["SMITH, JOHN", "DOE, JANE", None, "NA"]),
+            "Production Date": datetime.combine(START + timedelta(days=i % days), datetime.min.time()),
+            "OrderNumber": rng.choice([20000001, "20000002", 20000003.0, None, "N/A"]),
+            "Sum of Hours.": rng.choice([0.25, 1, 2.5, 8, None, "#N/A"]),
+            "Hours Estimated": rng.choice([None, 1, 4.0]),
+            "Status": rng.choice(["Open", "Complete", ""]),
+            "Type": rng.choice([0, 1, 2.0, "2", "P", "Q", None, "", "null"]),
+            "PMFrequency": None,
+            "Description": rng.choice(["Replace pump seal", "Inspect crane", "nan"]),
+            "Problem": rng.choice(["Leaking", None, "n/a", "Tripped breaker"]),
+            "Department": "Melt Shop",
+            "Location": "MS",
+            "Equipment": rng.choice(["EQ-101", None]),
+            "PM Number": None,
+            "PM": None,
+            "CostCenter": rng.choice([4100, "4200", None, " 4300 "]),
+        }
+        ws.append([values[col] for col in REQUIRED_TIME_COLUMNS])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def reference_load(data: bytes) -> pd.DataFrame:
+    """The original loader: find the header, then ``pd.read_excel(header=row)``."""
+    header_row = _find_header_row(pd.read_excel(io.BytesIO(data), header=None, dtype=str))
+    return _clean_time_frame(pd.read_excel(io.BytesIO(data), header=header_row))
+
+
+def _in_range(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    dates = df["Production Date"]
+    return df[(dates >= start) & (dates <= end)].reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "preamble, blank_every",
+    [(0, 0), (3, 0), (5, 7)],
+    ids=["no-preamble", "preamble", "preamble-and-blank-rows"],
+)
+def test_loaders_match_read_excel(preamble, blank_every):
+    data = make_workbook(200, preamble=preamble, blank_every=blank_every)
+    expected = reference_load(data)
+
+    pd.testing.assert_frame_equal(load_timeworkbook(io.BytesIO(data)), expected)
+    pd.testing.assert_frame_equal(load_timeworkbook_streaming(io.BytesIO(data), chunk_rows=64), expected)
+
+
+def test_streaming_date_range_matches_filtered_read_excel():
+    data = make_workbook(300, days=5)
+    start, end = START + timedelta(days=1), START + timedelta(days=3)
+    expected = _in_range(reference_load(data), start, end)
+
+    result = load_timeworkbook_streaming(io.BytesIO(data), start=start, end=end, chunk_rows=50)
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+
+
+def test_missing_header_raises():
+    wb = Workbook()
+    wb.active.append(["Not an export"])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+
+    with pytest.raises(ValueError):
+        load_timeworkbook(io.BytesIO(buffer.getvalue()))
+    with pytest.raises(ValueError):
+        load_timeworkbook_streaming(io.BytesIO(buffer.getvalue()))
@@ -0,0 +1,101 @@
+"""Tests for the detail table page planner (no matplotlib needed)."""
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from workorder_export import plan_detail_pages
+
+
+def _frame(line_counts, work_orders=None):
+    data = {"Description": ["\n".join(["x"] * n) for n in line_counts], "Problem": [""] * len(line_counts)}
+    if work_orders is not None:
+        data["Work Order #"] = work_orders
+    return pd.DataFrame(data)
+
+
+def _page_sizes(plan):
+    return [len(page) for page in plan["pages"]]
+
+
+def _reference_pages(line_counts, rows_per_page=20, header_lines=1):
+    """The original row-by-row page accumulation."""
+    base_height = 0.85 / (rows_per_page + 1)
+    header_height = base_height * header_lines
+    pages, current, height = [], [], header_height
+    for idx, lines in enumerate(line_counts):
+        row_height = base_height * lines
+        if height + row_height > 0.85 and current:
+            pages.append(current)
+            current, height = [idx], header_height + row_height
+        else:
+            current.append(idx)
+            height += row_height
+    if current:
+        pages.append(current)
+    return pages
+
+
+def test_empty_frame_has_no_pages():
+    plan = plan_detail_pages(_frame([]))
+
+    assert plan["pages"] == []
+    assert len(plan["line_counts"]) == 0
+    assert len(plan["shading"]) == 0
+
+
+def test_exact_fit_stays_on_one_page():
+    # The header plus rows_per_page single-line rows fill the table area exactly.
+    assert _page_sizes(plan_detail_pages(_frame([1] * 20))) == [20]
+    assert _page_sizes(plan_detail_pages(_frame([1] * 21))) == [20, 1]
+
+
+def test_single_tall_row_gets_its_own_page():
+    plan = plan_detail_pages(_frame([1, 1, 1, 40, 1, 1]))
+
+    assert [page.tolist() for page in plan["pages"]] == [[0, 1, 2], [3], [4, 5]]
+    assert plan["line_counts"].tolist() == [1, 1, 1, 40, 1, 1]
+
+
+def test_later_pages_reserve_the_header_again():
+    # Every page, not just the first, starts with the header row, so a page
+    # started by a break holds no more rows than the first one.
+    assert _page_sizes(plan_detail_pages(_frame([1] * 45))) == [20, 20, 5]
+    assert _page_sizes(plan_detail_pages(_frame([1] * 45), header_lines=3)) == [18, 18, 9]
+    # A row that did not fit is carried to the next page on top of the header.
+    assert _page_sizes(plan_detail_pages(_frame([1] * 18 + [4] + [1] * 20))) == [18, 17, 4]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pages_match_row_by_row_accumulation(seed):
+    rng = random.Random(seed)
+    line_counts = [rng.choice([1, 1, 1, 2, 3, 5, 8, 25]) for _ in range(300)]
+    header_lines = rng.choice([1, 2, 3])
+
+    plan = plan_detail_pages(_frame(line_counts), header_lines=header_lines)
+
+    assert [page.tolist() for page in plan["pages"]] == _reference_pages(line_counts, header_lines=header_lines)
+
+
+def test_work_order_shading_toggles_per_group():
+    plan = plan_detail_pages(_frame([1] * 6, ["1", "1", "2", "3", "3", "1"]), shade_by_work_order=True)
+
+    assert plan["shading"].tolist() == [True, True, False, True, True, False]
+    assert not plan_detail_pages(_frame([1] * 6, ["1"] * 6))["shading"].any()
+    assert np.issubdtype(plan["line_counts"].dtype, np.integer)
+
+
+def test_planning_does_not_import_matplotlib():
+    code = (
+        "import sys, pandas as pd\n"
+        "from workorder_export import plan_detail_pages\n"
+        "plan_detail_pages(pd.DataFrame({'Description': ['a\\nb'], 'Problem': ['']}))\n"
+        "print('matplotlib' in sys.modules)\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
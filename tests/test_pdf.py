@@ -0,0 +1,33 @@
+"""Tests for the PDF builders."""
+import io
+
+import pytest
+
+from workorder_export import build_pdf, get_address_book_df, get_craft_order_df, prepare_report_data
+
+pypdf = pytest.importorskip("pypdf")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def agg_backend():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _page_texts(pdf_bytes: bytes):
+    return [page.extract_text() for page in pypdf.PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+def test_parallel_pdf_matches_serial(time_df, caplog):
+    first = time_df["Production Date"].min()
+    report = prepare_report_data(time_df, get_address_book_df(), get_craft_order_df(), first)
+    assert len(report["groups"]) > 1
+
+    serial = build_pdf(report, "01/06/2025")
+    parallel = build_pdf(report, "01/06/2025", workers=2)
+
+    # A failed pool falls back to the serial path with a warning.
+    assert not [r for r in caplog.records if r.name == "workorder_export.pdf"]
+
+    assert _page_texts(parallel) == _page_texts(serial)
@@ -0,0 +1,106 @@
+"""Tests for reference data loaded from a file."""
+import json
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from workorder_export import (
+    ADDRESS_BOOK,
+    CRAFT_ORDER,
+    TYPE_MAP,
+    ReferenceWatcher,
+    apply_reference_data,
+    get_address_book_df,
+    load_reference_data,
+    reference_digests,
+)
+from workorder_export.data import _map_types
+
+PERSON = {"AddressBookNumber": "5550001", "Name": "NEW, PERSON", "Craft Description": "Segment Shop"}
+
+
+@pytest.fixture(autouse=True)
+def builtin_reference():
+    """Put the built-in tables back after each test."""
+    yield
+    apply_reference_data({})
+
+
+def test_apply_replaces_tables_in_place_and_clears_caches():
+    book = list(ADDRESS_BOOK) + [PERSON]
+    before = reference_digests()
+    assert PERSON["AddressBookNumber"] not in get_address_book_df()["AddressBookNumber"].tolist()
+
+    changed = apply_reference_data({"address_book": book, "type_map": {**TYPE_MAP, "Z": "Zone Work"}})
+
+    assert changed == ["address_book", "type_map"]
+    assert PERSON in ADDRESS_BOOK
+    assert PERSON["AddressBookNumber"] in get_address_book_df()["AddressBookNumber"].tolist()
+    assert _map_types(pd.Series(["Z"])).tolist() == ["Zone Work"]
+    after = reference_digests()
+    assert after["address_book"] != before["address_book"]
+    assert after["craft_order"] == before["craft_order"]
+    assert apply_reference_data({"address_book": book, "type_map": {**TYPE_MAP, "Z": "Zone Work"}}) == []
+
+
+def test_missing_tables_go_back_to_the_builtin_values():
+    builtin = list(CRAFT_ORDER)
+    apply_reference_data({"craft_order": ["Segment Shop"]})
+    assert CRAFT_ORDER == ["Segment Shop"]
+
+    assert apply_reference_data({}) == ["craft_order"]
+
+    assert CRAFT_ORDER == builtin
+
+
+def test_load_json_csv_and_sqlite(tmp_path):
+    json_path = tmp_path / "reference.json"
+    json_path.write_text(json.dumps({"address_book": [PERSON], "craft_order": ["Segment Shop"]}))
+    csv_path = tmp_path / "reference.csv"
+    csv_path.write_text('AddressBookNumber,Name,Craft Description\n 5550001 ,"NEW, PERSON",Segment Shop\n')
+    db_path = tmp_path / "reference.sqlite"
+    con = sqlite3.connect(db_path)
+    con.execute('CREATE TABLE address_book (AddressBookNumber, Name, "Craft Description")')
+    con.execute("INSERT INTO address_book VALUES (5550001, 'NEW, PERSON', 'Segment Shop')")
+    con.execute("CREATE TABLE type_map (code, name)")
+    con.execute("INSERT INTO type_map VALUES ('Z', 'Zone Work')")
+    con.commit()
+    con.close()
+
+    assert load_reference_data(json_path) == {"address_book": [PERSON], "craft_order": ["Segment Shop"]}
+    assert load_reference_data(csv_path) == {"address_book": [PERSON]}
+    assert load_reference_data(db_path) == {"address_book": [PERSON], "type_map": {"Z": "Zone Work"}}
+
+
+def test_unreadable_file_raises_value_error(tmp_path):
+    path = tmp_path / "reference.json"
+    path.write_text("{not json")
+
+    with pytest.raises(ValueError):
+        load_reference_data(path)
+    with pytest.raises(ValueError):
+        load_reference_data(tmp_path / "missing.json")
+
+
+def test_watcher_reloads_only_on_change(tmp_path):
+    path = tmp_path / "reference.json"
+    path.write_text(json.dumps({"address_book": list(ADDRESS_BOOK) + [PERSON]}))
+    watcher = ReferenceWatcher(path)
+
+    assert watcher.check() == ["address_book"]
+    assert watcher.check() == []
+
+    # A broken edit keeps the current tables and reports the error.
+    path.write_text("{not json")
+    os.utime(path, ns=(1, 1))
+    assert watcher.check() == []
+    assert watcher.error
+    assert PERSON in ADDRESS_BOOK
+
+    path.write_text(json.dumps({}))
+    os.utime(path, ns=(2, 2))
+    assert watcher.check() == ["address_book"]
+    assert watcher.error is None
+    assert PERSON not in ADDRESS_BOOK
@@ -0,0 +1,100 @@
+"""Tests for the hours cube and the reports built from it."""
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from workorder_export import (
+    compact_time_frame,
+    get_address_book_df,
+    get_craft_order_df,
+    hours_by_type,
+    index_time_data,
+    prepare_range_report,
+    prepare_report_data,
+)
+
+
+def _by_type(detail: pd.DataFrame) -> pd.Series:
+    """Hours by Type summed directly from report detail rows."""
+    hours = detail["Sum of Hours"].fillna(0.0)
+    return hours.groupby(detail["Type"].astype(object), dropna=False).sum().round(2).sort_index()
+
+
+def _cube_by_type(agg: pd.DataFrame) -> pd.Series:
+    return agg.set_index("Type")["hours"].round(2).sort_index()
+
+
+def _days(df):
+    return sorted(df["Production Date"].unique())
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["default", "compact"])
+def test_cube_matches_summing_the_detail_rows(time_df, compact):
+    frame = compact_time_frame(time_df)["frame"] if compact else time_df
+    index = index_time_data(frame, get_address_book_df())
+
+    for day in _days(time_df):
+        report = prepare_report_data(frame, get_address_book_df(), get_craft_order_df(), day, index=index)
+        assert report["groups"]
+        for craft, payload in report["groups"]:
+            pd.testing.assert_series_equal(
+                _cube_by_type(hours_by_type(index["cube"], day, craft)), _by_type(payload["detail"]), check_names=False
+            )
+        pd.testing.assert_series_equal(
+            _cube_by_type(report["hours_by_type"]), _by_type(report["full_detail"]), check_names=False
+        )
+
+
+def test_breakdown_is_sorted_with_percentages(time_df):
+    index = index_time_data(time_df, get_address_book_df())
+
+    agg = hours_by_type(index["cube"], _days(time_df)[0])
+
+    assert agg["hours"].is_monotonic_decreasing
+    assert agg["percent"].sum() == pytest.approx(100.0)
+    assert hours_by_type(index["cube"], _days(time_df)[0], "No Such Craft").empty
+
+
+def _summed_daily(frame, index, days):
+    """Hours by Type per craft (and "" for the whole report) summed over daily reports."""
+    totals = {}
+    for day in days:
+        report = prepare_report_data(frame, get_address_book_df(), get_craft_order_df(), day, index=index)
+        for craft, payload in report["groups"] + [("", report)]:
+            totals.setdefault(craft, []).append(payload["hours_by_type"][["Type", "hours"]])
+    return {
+        craft: pd.concat(parts).groupby("Type", dropna=False)["hours"].sum().round(2).sort_index()
+        for craft, parts in totals.items()
+    }
+
+
+@pytest.mark.parametrize("span", [(0, 0), (0, 1), (1, 2), (0, 2)], ids=["one-day", "first-two", "last-two", "all"])
+def test_range_report_matches_summing_daily_reports(time_df, span):
+    days = _days(time_df)
+    start, end = days[span[0]], days[span[1]]
+    index = index_time_data(time_df, get_address_book_df())
+
+    report = prepare_range_report(time_df, get_address_book_df(), get_craft_order_df(), start, end, index=index)
+
+    expected = _summed_daily(time_df, index, days[span[0] : span[1] + 1])
+    craft_order = get_craft_order_df()["Craft Description"].tolist() + ["Unassigned"]
+    assert [craft for craft, _ in report["groups"]] == [c for c in craft_order if c in expected]
+    for craft, payload in report["groups"]:
+        pd.testing.assert_series_equal(_cube_by_type(payload["hours_by_type"]), expected[craft], check_names=False)
+    pd.testing.assert_series_equal(_cube_by_type(report["hours_by_type"]), expected[""], check_names=False)
+    assert report["dates"] == days[span[0] : span[1] + 1]
+    assert list(report["daily"].index) == report["dates"]
+    assert report["daily"].to_numpy().sum() == pytest.approx(expected[""].sum())
+
+
+def test_range_report_without_data(time_df):
+    last = _days(time_df)[-1]
+
+    report = prepare_range_report(
+        time_df, get_address_book_df(), get_craft_order_df(), last + timedelta(days=1), last + timedelta(days=30)
+    )
+
+    assert report["groups"] == []
+    assert report["dates"] == []
+    assert report["hours_by_type"].empty
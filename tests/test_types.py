@@ -0,0 +1,42 @@
+"""Tests for the work order type mapping."""
+import numpy as np
+import pandas as pd
+
+from workorder_export import TYPE_MAP
+from workorder_export.data import _map_types
+
+
+def _map_type(value):
+    """The original per-row mapping, applied with ``Series.apply``."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return pd.NA
+    key = str(value).strip()
+    if key == "" or key.lower() == "nan":
+        return pd.NA
+    if key.endswith(".0"):
+        key = key[:-2]
+    out = TYPE_MAP.get(key, key)
+    if isinstance(out, str) and out.strip().lower() == "inspection maintenance order":
+        return "PM Inspection"
+    return out
+
+
+def test_map_types_matches_per_row_mapping():
+    values = pd.Series(
+        [0, 1, 7, "7", 4.0, "5.0", " 2 ", "P", "C", "ZZ", "inspection maintenance order", np.nan, None, "", "nan", 1],
+        index=range(100, 116),
+        name="Type",
+        dtype=object,
+    )
+
+    result = _map_types(values)
+
+    expected = values.apply(_map_type)
+    pd.testing.assert_series_equal(result, expected.astype(object))
+    assert result.loc[[111, 112, 113, 114]].isna().all()
+
+
+def test_map_types_numeric_column():
+    values = pd.Series([1.0, 4.0, np.nan, 1.0], name="Type")
+
+    pd.testing.assert_series_equal(_map_types(values), values.apply(_map_type).astype(object))
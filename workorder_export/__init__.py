@@ -0,0 +1,79 @@
+"""Data loading, report preparation and PDF export for the Daily MS Work Order Log.
+
+The Streamlit dashboard (``app (5).py``) and the batch exporter
+(``export_pdfs.py``) are both built on this package.  Importing it does not
+import Streamlit, matplotlib, ReportLab or Altair.
+"""
+from .cache import FrameCache, content_hash, load_timeworkbook_cached
+from .data import (
+    build_hours_cube,
+    compact_time_frame,
+    compile_address_book,
+    get_address_book_df,
+    get_craft_order_df,
+    hours_by_type,
+    index_time_data,
+    load_timeworkbook,
+    load_timeworkbook_streaming,
+    prepare_range_report,
+    prepare_report_data,
+)
+from .history import HistoryStore, default_history_path
+from .incremental import IncrementalStore, date_digests
+from .mappings import (
+    ADDRESS_BOOK,
+    CRAFT_ORDER,
+    DISPLAY_COLUMNS,
+    PDF_COLUMN_WIDTHS,
+    REQUIRED_TIME_COLUMNS,
+    TYPE_COLORS,
+    TYPE_MAP,
+)
+from .pdf import PDF_BACKENDS, build_pdf, plan_detail_pages, wrap_cache_stats
+from .reference import (
+    ReferenceWatcher,
+    apply_reference_data,
+    default_reference_path,
+    load_reference_data,
+    reference_digests,
+)
+from .timing import Timings, span
+
+__all__ = [
+    "ADDRESS_BOOK",
+    "CRAFT_ORDER",
+    "DISPLAY_COLUMNS",
+    "FrameCache",
+    "HistoryStore",
+    "IncrementalStore",
+    "PDF_BACKENDS",
+    "PDF_COLUMN_WIDTHS",
+    "REQUIRED_TIME_COLUMNS",
+    "ReferenceWatcher",
+    "TYPE_COLORS",
+    "TYPE_MAP",
+    "Timings",
+    "apply_reference_data",
+    "build_hours_cube",
+    "build_pdf",
+    "compact_time_frame",
+    "compile_address_book",
+    "content_hash",
+    "date_digests",
+    "default_history_path",
+    "default_reference_path",
+    "get_address_book_df",
+    "get_craft_order_df",
+    "hours_by_type",
+    "index_time_data",
+    "load_reference_data",
+    "load_timeworkbook",
+    "load_timeworkbook_cached",
+    "load_timeworkbook_streaming",
+    "plan_detail_pages",
+    "prepare_range_report",
+    "prepare_report_data",
+    "reference_digests",
+    "span",
+    "wrap_cache_stats",
+]
@@ -0,0 +1,197 @@
+"""On-disk cache of cleaned time workbooks.
+
+The same rolling Time on Work Order export is uploaded many times a day.
+Loading spends nearly all of its time parsing the xlsx, so the cleaned frame
+is stored as an Arrow IPC file named after the SHA-256 of the uploaded
+bytes.  A repeat upload of an identical file is read back through a
+memory map instead of being parsed again.
+
+pyarrow is imported lazily; without it the cache is a no-op and every load
+parses the workbook.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from .data import load_timeworkbook_streaming
+
+# Bump when the loaders change the shape or contents of the cleaned
+# frame so files written by older versions are no longer read.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Schema metadata key recording which missing-value sentinel each object
+# column used, so NaN and pd.NA come back as they went in.
+_NA_METADATA_KEY = b"workorder_export.na"
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest of an uploaded file's contents."""
+    return hashlib.sha256(data).hexdigest()
+
+def default_cache_dir() -> Path:
+    """Return the cache directory from ``WORKORDER_EXPORT_CACHE_DIR`` or the
+    per-user default."""
+    env = os.environ.get("WORKORDER_EXPORT_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "workorder_export"
+
+def _to_arrow(df: pd.DataFrame):
+    """Convert the cleaned frame to an Arrow table.
+
+    Object columns that mix Python types (for example ``Type`` codes read as
+    both numbers and letters) cannot be stored as one Arrow type; their
+    non-missing values are stored as strings.  Everything downstream reads
+    those columns through ``str()``, so the reports are unchanged.
+    """
+    import pyarrow as pa
+
+    out = df.copy()
+    na_kinds: Dict[str, str] = {}
+    for col in out.columns:
+        values = out[col]
+        if values.dtype != object:
+            continue
+        missing = values.isna()
+        if missing.any():
+            first = values[missing].iloc[0]
+            na_kinds[str(col)] = "NA" if first is pd.NA else "nan"
+        try:
+            pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            out[col] = values.astype(str).where(~missing, None)
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_NA_METADATA_KEY] = json.dumps(na_kinds).encode()
+    return table.replace_schema_metadata(metadata)
+
+def _from_arrow(table) -> pd.DataFrame:
+    """Convert a cached Arrow table back to the cleaned frame."""
+    df = table.to_pandas()
+    raw = (table.schema.metadata or {}).get(_NA_METADATA_KEY)
+    na_kinds: Dict[str, str] = json.loads(raw) if raw else {}
+    for col, kind in na_kinds.items():
+        if col in df.columns:
+            sentinel = pd.NA if kind == "NA" else float("nan")
+            df[col] = df[col].astype(object).where(df[col].notna(), sentinel)
+    return df
+
+def write_arrow(path: str | os.PathLike, df: pd.DataFrame) -> None:
+    """Write ``df`` to an Arrow IPC file at ``path``.
+
+    The file is written to a uniquely named file next to ``path`` and moved
+    into place, so readers never see a partly written file, even when
+    several threads (for example Streamlit sessions) write the same path."""
+    import pyarrow as pa
+
+    table = _to_arrow(df)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def read_arrow(path: str | os.PathLike) -> pd.DataFrame:
+    """Read a frame written by ``write_arrow`` through a memory map.
+
+    The frame is built before the map is closed, so the file is not held
+    open afterwards and can be replaced or evicted."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as source:
+        return _from_arrow(pa.ipc.open_file(source).read_all())
+
+class FrameCache:
+    """Size-capped directory of cleaned time frames keyed by content hash.
+
+    Reading a file refreshes its modification time, and writing a new file
+    evicts the least recently used files until the directory is back under
+    ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.v{CACHE_VERSION}.arrow"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Return the cached frame for ``key`` or None if it is not cached."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            df = read_arrow(path)
+            os.utime(path)
+        except Exception:
+            # A truncated or unreadable file is treated as a miss.
+            return None
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Store ``df`` under ``key`` and evict old entries over the size cap.
+
+        Frames that cannot be converted to Arrow are simply not cached."""
+        try:
+            write_arrow(self._path(key), df)
+        except Exception:
+            return
+        self.evict()
+
+    def entries(self) -> List[Path]:
+        """Return the cached files, least recently used first."""
+        if not self.directory.exists():
+            return []
+        files = list(self.directory.glob("*.arrow"))
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+
+    def evict(self) -> None:
+        """Remove least recently used files until the cache fits in ``max_bytes``.
+
+        Files written by other cache versions are removed first."""
+        files = self.entries()
+        stale = [p for p in files if not p.name.endswith(f".v{CACHE_VERSION}.arrow")]
+        current = [p for p in files if p not in stale]
+        total = sum(p.stat().st_size for p in current)
+        for path in stale:
+            path.unlink(missing_ok=True)
+        for path in current:
+            if total <= self.max_bytes:
+                break
+            size = path.stat().st_size
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+def load_timeworkbook_cached(data: bytes, cache: FrameCache | None = None, key: str | None = None) -> pd.DataFrame:
+    """Load the cleaned time frame for an uploaded workbook, reading it from
+    ``cache`` when an identical file has been loaded before.
+
+    :param data: The uploaded workbook bytes.
+    :param cache: The on-disk cache.  When None the workbook is always parsed.
+    :param key: The content hash of ``data`` if the caller already has it.
+    """
+    if cache is None:
+        return load_timeworkbook_streaming(io.BytesIO(data))
+    key = key or content_hash(data)
+    df = cache.get(key)
+    if df is None:
+        df = load_timeworkbook_streaming(io.BytesIO(data))
+        cache.put(key, df)
+    return df
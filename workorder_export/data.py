@@ -0,0 +1,731 @@
+"""Loading and preparation of the Time on Work Order export."""
+import functools
+import io
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .mappings import ADDRESS_BOOK, CRAFT_ORDER, DISPLAY_COLUMNS, REQUIRED_TIME_COLUMNS, TYPE_MAP
+from .timing import span
+
+def _find_header_row(df_raw: pd.DataFrame) -> int:
+    """Locate the header row in an Excel export by searching for a row that
+    contains the expected column names.  Raises if the header cannot be found.
+    """
+    first_col = df_raw.columns[0]
+    mask = df_raw[first_col].astype(str).str.strip() == "AddressBookNumber"
+    idx = df_raw.index[mask].tolist()
+    if idx:
+        return idx[0]
+    # Fallback: search the first few rows for known column names.
+    for i in range(min(10, len(df_raw))):
+        row_vals = df_raw.iloc[i].astype(str).str.strip().tolist()
+        if "AddressBookNumber" in row_vals and "Production Date" in row_vals:
+            return i
+    raise ValueError("Could not locate header row containing 'AddressBookNumber'.")
+
+def _read_excel_grid(file) -> pd.DataFrame:
+    """Parse the uploaded Excel file once, without headers.
+
+    The raw grid is used both to locate the header row and to build the typed
+    frame, so the workbook is only run through openpyxl a single time."""
+    data = file.read()
+    return pd.read_excel(io.BytesIO(data), header=None)
+
+def _frame_from_grid(df_raw: pd.DataFrame, header_row: int) -> pd.DataFrame:
+    """Build the typed DataFrame from the raw grid using ``header_row`` as the
+    header.  The rows are run through the same text parser ``pd.read_excel``
+    uses internally, so column names and dtypes match a direct
+    ``pd.read_excel(file, header=header_row)`` call."""
+    from pandas.io.parsers import TextParser
+
+    rows = df_raw.astype(object).where(df_raw.notna(), "").values.tolist()
+    parser = TextParser(rows, header=header_row, skip_blank_lines=False)
+    return parser.read()
+
+def load_timeworkbook(file_like) -> pd.DataFrame:
+    """Load and clean the Time on Work Order export."""
+    with span("parse"):
+        df_raw = _read_excel_grid(file_like)
+    with span("header detect"):
+        header_row = _find_header_row(df_raw)
+    with span("normalize"):
+        return _clean_time_frame(_frame_from_grid(df_raw, header_row))
+
+# ---------------------------------------------------------------------------
+# Streaming loader
+#
+# ``load_timeworkbook`` holds the uploaded bytes, the raw grid and the typed
+# frame at the same time, which is a lot for a quarter's export.  The
+# streaming loader reads the sheet row by row through openpyxl's read-only
+# mode and collects the kept rows into per-column object arrays a chunk at a
+# time, so the rows of the sheet are never all held as Python tuples and rows
+# outside the requested dates are dropped as they are read.
+
+# Number of leading rows searched for both "AddressBookNumber" and
+# "Production Date" when no row starts with "AddressBookNumber".
+_HEADER_SCAN_ROWS = 10
+
+def _is_header_row(values: tuple, position: int) -> bool:
+    """Return True if ``values`` (the row at ``position``) is the header row.
+
+    Mirrors ``_find_header_row``, except that the first row matching either
+    test is used rather than preferring a first-column match further down."""
+    stripped = [str(v).strip() for v in values]
+    if stripped and stripped[0] == "AddressBookNumber":
+        return True
+    return position < _HEADER_SCAN_ROWS and "AddressBookNumber" in stripped and "Production Date" in stripped
+
+def _header_names(values: tuple) -> List[str]:
+    """Return the column names ``pd.read_excel`` would give this header row:
+    blank names become "Unnamed: <position>" and repeats get ".1", ".2", ..."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            name = f"Unnamed: {i}"
+        elif isinstance(value, float) and value.is_integer():
+            name = str(int(value))
+        else:
+            name = str(value)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+def _convert_cell(value: Any, missing: frozenset) -> Any:
+    """Convert a cell value the way ``pd.read_excel`` does: blanks and the
+    strings in ``missing`` (error values and the parser's NA strings) are
+    missing, and whole-number floats become ints."""
+    if value is None:
+        return np.nan
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in missing:
+        return np.nan
+    return value
+
+def _date_mask(values: np.ndarray, start, end) -> np.ndarray:
+    """Return which cells of a Production Date column fall between ``start``
+    and ``end`` (inclusive; either may be None)."""
+    days = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").dt.normalize()
+    mask = days.notna()
+    if start is not None:
+        mask &= days >= pd.Timestamp(start)
+    if end is not None:
+        mask &= days <= pd.Timestamp(end)
+    return mask.to_numpy()
+
+def load_timeworkbook_streaming(file_like, start=None, end=None, chunk_rows: int = 20000) -> pd.DataFrame:
+    """Load and clean the Time on Work Order export without loading the whole
+    sheet at once.
+
+    The result matches ``load_timeworkbook`` for the same file, restricted
+    to rows whose Production Date is between ``start`` and ``end`` when
+    either is given.  Peak memory is roughly the kept rows plus one chunk.
+
+    :param file_like: Path or binary file-like object of the workbook.
+    :param start: First Production Date to keep (inclusive), or None.
+    :param end: Last Production Date to keep (inclusive), or None.
+    :param chunk_rows: Number of sheet rows converted to columns at a time.
+    """
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import ERROR_CODES
+    from pandas._libs.parsers import STR_NA_VALUES
+
+    missing = frozenset(STR_NA_VALUES) | frozenset(ERROR_CODES)
+    filtering = start is not None or end is not None
+    wb = load_workbook(file_like, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        names: List[str] | None = None
+        with span("header detect"):
+            for position, values in enumerate(rows):
+                if _is_header_row(values, position):
+                    names = _header_names(values)
+                    break
+        if names is None:
+            raise ValueError("Could not locate header row containing 'AddressBookNumber'.")
+        width = len(names)
+        date_col = names.index("Production Date") if "Production Date" in names else None
+        columns: List[List[np.ndarray]] = [[] for _ in names]
+        chunk: List[tuple] = []
+        blank_run = 0
+
+        def flush() -> None:
+            block = np.empty((len(chunk), width), dtype=object)
+            for r, row in enumerate(chunk):
+                cells = [_convert_cell(v, missing) for v in row[:width]]
+                block[r, : len(cells)] = cells
+                block[r, len(cells) :] = np.nan
+            if filtering:
+                keep = _date_mask(block[:, date_col], start, end) if date_col is not None else np.zeros(len(block), bool)
+                block = block[keep]
+            for i in range(width):
+                columns[i].append(block[:, i].copy())
+            chunk.clear()
+
+        with span("parse"):
+            for values in rows:
+                # Blank rows are kept like ``pd.read_excel`` keeps them, except a
+                # trailing run at the end of the sheet.
+                if all(v is None or v == "" for v in values):
+                    blank_run += 1
+                    continue
+                chunk.extend([()] * blank_run)
+                blank_run = 0
+                chunk.append(values)
+                if len(chunk) >= chunk_rows:
+                    flush()
+            if chunk:
+                flush()
+    finally:
+        wb.close()
+
+    with span("normalize"):
+        return _clean_time_frame(_typed_columns(names, columns))
+
+def _typed_columns(names: List[str], columns: List[List[np.ndarray]]) -> pd.DataFrame:
+    """Join the chunks of each streamed column and type it."""
+    data: Dict[str, pd.Series] = {}
+    for name, parts in zip(names, columns):
+        values = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+        # Columns are typed once all rows are in, the way the text parser
+        # behind ``pd.read_excel`` infers them: numeric if every value
+        # converts, otherwise left as objects.
+        try:
+            data[name] = pd.to_numeric(pd.Series(values, dtype=object))
+        except (ValueError, TypeError):
+            data[name] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data)
+
+def _clean_time_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean the typed frame read from the export (shared by both loaders)."""
+    # Drop unnamed columns
+    df = df.loc[:, ~df.columns.astype(str).str.contains(r"^Unnamed")]
+    # === Ensure CostCenter column exists and is cleaned ===
+    try:
+        if "CostCenter" not in df.columns:
+            if df.shape[1] > 13:
+                df["CostCenter"] = df.iloc[:, 13]
+            else:
+                df["CostCenter"] = pd.NA
+        df["CostCenter"] = df["CostCenter"].astype(str).fillna("").str.strip().replace({"nan": ""})
+    except Exception:
+        df["CostCenter"] = pd.NA
+    # === End CostCenter ensure ===
+
+    # Ensure all required columns exist
+    for c in REQUIRED_TIME_COLUMNS:
+        if c not in df.columns:
+            df[c] = pd.NA
+    # === Custom: Map CostCenter (column N) into 'CC' from the SAME uploaded sheet ===
+    try:
+        if "CostCenter" in df.columns:
+            df["CC"] = df["CostCenter"].astype(str).fillna("").str.strip().replace({"nan": ""})
+        else:
+            # Fallback by position: column N (14th column, index 13) from the already-read df
+            if df.shape[1] > 13:
+                _series = df.iloc[:, 13].astype(str)
+                df["CC"] = _series.fillna("").str.strip().replace({"nan": ""})
+            else:
+                df["CC"] = pd.NA
+    except Exception:
+        df["CC"] = pd.NA
+    # === End Custom ===
+
+    df["AddressBookNumber"] = df["AddressBookNumber"].astype(str).str.strip()
+    if "Production Date" in df.columns:
+        df["Production Date"] = pd.to_datetime(df["Production Date"], errors="coerce").dt.date
+    # Normalize 'Sum of Hours' column names and values
+    if "Sum of Hours" in df.columns:
+        df["Sum of Hours"] = pd.to_numeric(df["Sum of Hours"], errors="coerce")
+    elif "Sum of Hours." in df.columns:
+        df["Sum of Hours"] = pd.to_numeric(df["Sum of Hours."], errors="coerce")
+    elif "Hours" in df.columns:
+        df["Sum of Hours"] = pd.to_numeric(df["Hours"], errors="coerce")
+    else:
+        df["Sum of Hours"] = pd.NA
+    # Normalize work order number into 'Work Order #'
+    if "Work Order Number" in df.columns:
+        base_wo = df["Work Order Number"]
+    elif "OrderNumber" in df.columns:
+        base_wo = df["OrderNumber"]
+    elif "WO Number" in df.columns:
+        base_wo = df["WO Number"]
+    elif "WorkOrderNumber" in df.columns:
+        base_wo = df["WorkOrderNumber"]
+    else:
+        base_wo = pd.Series([pd.NA] * len(df))
+    df["Work Order #"] = base_wo.astype(str).str.replace(r"\.0$", "", regex=True)
+    if "Problem" not in df.columns:
+        df["Problem"] = pd.NA
+    return df
+
+# ---------------------------------------------------------------------------
+# Compact schema
+#
+# The cleaned frame stores every text column as Python strings in object
+# columns.  Most of them repeat a handful of values, so in compact mode they
+# are stored as categoricals, the dates as datetime64 and the hours as
+# float32.  A multi-month frame then takes a fraction of the memory, and
+# filters and groupbys on those columns work on integer codes.
+
+# Low-cardinality text columns stored as categoricals in compact mode.
+COMPACT_CATEGORY_COLUMNS: List[str] = [
+    "Name",
+    "Type",
+    "CostCenter",
+    "CC",
+    "Department",
+    "Location",
+    "Status",
+    "AddressBookNumber",
+]
+
+# Text left behind in ``Work Order #`` by ``astype(str)`` for missing numbers.
+_MISSING_WORK_ORDER_TEXT = ["nan", "<NA>", "None", "NaT", ""]
+
+def compact_time_frame(time_df: pd.DataFrame) -> Dict[str, Any]:
+    """Convert a cleaned time frame to the compact schema.
+
+    ``time_df`` is not modified.  Returns a dictionary with keys:
+      - ``frame``: the compact frame.  ``Work Order #`` holds missing values
+        instead of the text "nan".
+      - ``bytes_before``: the deep memory usage of ``time_df``.
+      - ``bytes_after``: the deep memory usage of the compact frame.
+    """
+    df = time_df.copy()
+    for col in COMPACT_CATEGORY_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            # Categories must share one type, so mixed codes (numbers and
+            # letters in ``Type``) are stored as their text.
+            if values.dtype == object and values.dropna().map(type).nunique() > 1:
+                values = values.astype(str).where(values.notna(), np.nan)
+            df[col] = values.astype("category")
+    if "Production Date" in df.columns:
+        df["Production Date"] = pd.to_datetime(df["Production Date"], errors="coerce")
+    if "Sum of Hours" in df.columns:
+        df["Sum of Hours"] = pd.to_numeric(df["Sum of Hours"], errors="coerce").astype(np.float32)
+    if "Work Order #" in df.columns:
+        work_orders = df["Work Order #"].astype(object)
+        df["Work Order #"] = work_orders.mask(work_orders.isin(_MISSING_WORK_ORDER_TEXT), np.nan)
+    return {
+        "frame": df,
+        "bytes_before": int(time_df.memory_usage(deep=True).sum()),
+        "bytes_after": int(df.memory_usage(deep=True).sum()),
+    }
+
+def get_craft_order_df() -> pd.DataFrame:
+    """Return a DataFrame with the craft order."""
+    return pd.DataFrame({"Craft Description": CRAFT_ORDER})
+
+@functools.lru_cache(maxsize=1)
+def _address_book_frame() -> pd.DataFrame:
+    df = pd.DataFrame(ADDRESS_BOOK)[["AddressBookNumber", "Name", "Craft Description"]]
+    df["AddressBookNumber"] = df["AddressBookNumber"].astype(str).str.strip()
+    df["Name"] = df["Name"].astype(str).str.strip()
+    df["Craft Description"] = df["Craft Description"].astype(str).str.strip()
+    return df
+
+def get_address_book_df() -> pd.DataFrame:
+    """Return a cleaned DataFrame of the address book.
+
+    The frame is built once; each call returns a copy the caller may modify."""
+    return _address_book_frame().copy()
+
+# ---------------------------------------------------------------------------
+# Address book lookup
+#
+# Joining the address book used to mean stripping both key columns and a
+# ``merge`` on every index build.  Instead the address book is compiled once
+# into an index of AddressBookNumber with the craft and name of each entry in
+# parallel arrays.  The join is then one ``get_indexer`` and two ``take``
+# calls, and the rows without an entry (position -1) are found in the same
+# pass.  Compiled lookups are kept per address book content.
+_ADDRESS_BOOK_LOOKUPS: Dict[str, Dict[str, Any]] = {}
+_ADDRESS_BOOK_LOOKUP_LIMIT = 8
+
+def compile_address_book(addr_df: pd.DataFrame) -> Dict[str, Any]:
+    """Compile ``addr_df`` into an indexed lookup.
+
+    Numbers, names and crafts are stripped; an empty craft counts as no
+    craft, and the first entry wins for a repeated number.  Returns a
+    dictionary with keys:
+      - ``numbers``: a ``pd.Index`` of the AddressBookNumbers.
+      - ``crafts`` / ``names``: object arrays aligned with ``numbers`` with
+        one extra missing value at the end, so taking position -1 (a number
+        not in the address book) gives a missing value.
+      - ``digest``: a digest of the address book's content.
+    """
+    ab = addr_df[["AddressBookNumber", "Craft Description", "Name"]].astype(str)
+    digest = f"{len(ab)}-{pd.util.hash_pandas_object(ab, index=False).to_numpy().sum():016x}"
+    lookup = _ADDRESS_BOOK_LOOKUPS.get(digest)
+    if lookup is not None:
+        return lookup
+    ab = ab.apply(lambda col: col.str.strip())
+    ab = ab[~ab["AddressBookNumber"].duplicated()]
+    crafts = ab["Craft Description"].where(ab["Craft Description"].str.len() > 0)
+    lookup = {
+        "numbers": pd.Index(ab["AddressBookNumber"]),
+        "crafts": np.append(crafts.to_numpy(dtype=object), np.nan),
+        "names": np.append(ab["Name"].to_numpy(dtype=object), np.nan),
+        "digest": digest,
+    }
+    if len(_ADDRESS_BOOK_LOOKUPS) >= _ADDRESS_BOOK_LOOKUP_LIMIT:
+        _ADDRESS_BOOK_LOOKUPS.pop(next(iter(_ADDRESS_BOOK_LOOKUPS)))
+    _ADDRESS_BOOK_LOOKUPS[digest] = lookup
+    return lookup
+
+def _address_book_positions(numbers: pd.Series, lookup: Dict[str, Any]) -> np.ndarray:
+    """Return the position of each AddressBookNumber in ``lookup``, or -1."""
+    if isinstance(numbers.dtype, pd.CategoricalDtype):
+        # Look up each category once; code -1 (missing) takes the trailing -1.
+        category_positions = lookup["numbers"].get_indexer(numbers.cat.categories.astype(str))
+        return np.append(category_positions, -1)[numbers.cat.codes.to_numpy()]
+    return lookup["numbers"].get_indexer(numbers)
+
+def _craft_categories(order_df: pd.DataFrame) -> List[str]:
+    """Return the crafts in report order: ``order_df`` without repeats, then "Unassigned"."""
+    order = order_df["Craft Description"].tolist()
+    seen: set[str] = set()
+    ordered: List[str] = []
+    for c in order:
+        if c not in seen:
+            ordered.append(c)
+            seen.add(c)
+    return ordered + ["Unassigned"]
+
+def _apply_craft_category(df: pd.DataFrame, order_df: pd.DataFrame) -> pd.DataFrame:
+    """Assign categories to the craft description column so crafts are ordered consistently."""
+    categories = _craft_categories(order_df)
+    df["Craft Description"] = df["Craft Description"].fillna("Unassigned")
+    df["Craft Description"] = pd.Categorical(df["Craft Description"], categories=categories, ordered=True)
+    return df
+
+# Clean up the inspection maintenance wording: any code whose description is
+# "inspection maintenance order" is reported as "PM Inspection".
+_INSPECTION_WORDING = "inspection maintenance order"
+
+@functools.lru_cache(maxsize=1)
+def _type_lookup() -> Dict[str, str]:
+    return {
+        code: ("PM Inspection" if name.strip().lower() == _INSPECTION_WORDING else name)
+        for code, name in TYPE_MAP.items()
+    }
+
+def _reset_reference_caches() -> None:
+    """Drop the values built from the address book and type map after they
+    are reloaded (see ``reference``)."""
+    _address_book_frame.cache_clear()
+    _type_lookup.cache_clear()
+
+def _map_types(values: pd.Series) -> pd.Series:
+    """Map a column of work order type codes to their descriptive names.
+
+    The column is factorized so the string normalization only runs over the
+    distinct codes.  Codes are stripped and a trailing ".0" from numeric
+    cells is removed before the lookup.  Missing, blank and "nan" codes
+    become ``pd.NA``; codes not found in ``TYPE_MAP`` are returned as-is.
+    """
+    codes, uniques = pd.factorize(values)
+    keys = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    keys = keys.mask(keys.eq("") | keys.str.lower().eq("nan"))
+    keys = keys.str.replace(r"\.0$", "", regex=True)
+    labels = keys.map(_type_lookup())
+    unknown = labels.isna() & keys.notna()
+    passthrough = keys[unknown]
+    labels[unknown] = passthrough.mask(passthrough.str.lower().eq(_INSPECTION_WORDING), "PM Inspection")
+    labels = labels.astype(object).where(labels.notna(), pd.NA)
+    # Factorize marks missing values with -1, which picks the trailing NA.
+    table = np.append(labels.to_numpy(dtype=object), pd.NA)
+    return pd.Series(table[codes], index=values.index, name=values.name, dtype=object)
+
+# ---------------------------------------------------------------------------
+# Hours cube
+#
+# The dashboard metrics, the Altair charts and every PDF summary page show
+# hours by work order type for one craft or for the whole day.  Instead of
+# copying each detail frame and grouping it on every rerun and again in
+# ``build_pdf``, the hours are summed once per (Production Date, Craft
+# Description, Type) when the data is indexed, and a summary is a lookup.
+
+def _date_key(value):
+    """Return the ``date`` used to key reports for a Production Date value."""
+    return value.date() if isinstance(value, pd.Timestamp) else value
+
+def build_hours_cube(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Sum hours by (Production Date, Craft Description, Type).
+
+    ``frame`` is the joined frame from ``index_time_data``.  Hours, crafts
+    and types are normalized the way ``prepare_report_data`` normalizes the
+    detail rows, so the sums match a groupby of the report's detail frames.
+
+    Returns a dictionary with keys:
+      - ``by_craft``: a frame of ``Production Date``, ``Craft Description``,
+        ``Type`` and ``hours``, sorted by those keys.
+      - ``by_craft_rows``: a mapping of (date, craft) to row positions in
+        ``by_craft``.
+      - ``by_date``: the same hours summed over crafts, with ``Production
+        Date``, ``Type`` and ``hours`` columns.
+      - ``by_date_rows``: a mapping of date to row positions in ``by_date``.
+      - ``days``: the sorted distinct dates as ``datetime64[D]``.
+      - ``by_craft_days``: the date of each ``by_craft`` row as
+        ``datetime64[D]``, for binary-search slicing of a date range.
+      - ``range_keys``: the distinct (Craft Description, Type) pairs.
+      - ``cum_hours`` / ``cum_rows``: cumulative hours and row counts per
+        ``range_keys`` pair, one row per date plus a leading zero row, so
+        the totals for any date range are one subtraction.
+    """
+    hours = frame["Sum of Hours"]
+    if hours.dtype == np.float32:
+        hours = hours.astype(np.float64).round(4)
+    crafts = frame["Craft Description"]
+    crafts = crafts.where(crafts.notna() & (crafts.astype(str).str.len() > 0), "Unassigned")
+    keys = pd.DataFrame(
+        {
+            "Production Date": frame["Production Date"],
+            "Craft Description": crafts.astype(object),
+            "Type": _map_types(frame["Type"]) if "Type" in frame.columns else pd.NA,
+            "hours": pd.to_numeric(hours, errors="coerce").round(2).fillna(0.0),
+        }
+    )
+    by_craft = (
+        keys.groupby(["Production Date", "Craft Description", "Type"], dropna=False)["hours"].sum().reset_index()
+    )
+    by_craft = by_craft[by_craft["Production Date"].notna()].reset_index(drop=True)
+    by_date = by_craft.groupby(["Production Date", "Type"], dropna=False)["hours"].sum().reset_index()
+    by_craft_rows = {
+        (_date_key(d), craft): rows
+        for (d, craft), rows in by_craft.groupby(["Production Date", "Craft Description"], sort=False).indices.items()
+    }
+    by_date_rows = {_date_key(d): rows for d, rows in by_date.groupby("Production Date", sort=False).indices.items()}
+
+    # Cumulative sums over the sorted dates for range reports.
+    by_craft_days = pd.to_datetime(by_craft["Production Date"]).to_numpy(dtype="datetime64[D]")
+    days = np.unique(by_craft_days)
+    key_groups = by_craft.groupby(["Craft Description", "Type"], dropna=False, sort=True)
+    range_keys = key_groups.size().reset_index()[["Craft Description", "Type"]]
+    day_codes = np.searchsorted(days, by_craft_days) + 1
+    key_codes = key_groups.ngroup().to_numpy()
+    daily_hours = np.zeros((len(days) + 1, len(range_keys)))
+    daily_rows = np.zeros((len(days) + 1, len(range_keys)), dtype=np.int64)
+    np.add.at(daily_hours, (day_codes, key_codes), by_craft["hours"].to_numpy(dtype=np.float64))
+    np.add.at(daily_rows, (day_codes, key_codes), 1)
+    return {
+        "by_craft": by_craft,
+        "by_craft_rows": by_craft_rows,
+        "by_date": by_date,
+        "by_date_rows": by_date_rows,
+        "days": days,
+        "by_craft_days": by_craft_days,
+        "range_keys": range_keys,
+        "cum_hours": daily_hours.cumsum(axis=0),
+        "cum_rows": daily_rows.cumsum(axis=0),
+    }
+
+def _breakdown(agg: pd.DataFrame) -> pd.DataFrame:
+    """Sort ``Type``/``hours`` rows by hours descending and add ``percent``."""
+    agg = agg.reset_index(drop=True).sort_values("hours", ascending=False)
+    total = float(agg["hours"].sum())
+    agg["percent"] = np.where(total > 0, (agg["hours"] / total) * 100.0, 0.0)
+    return agg
+
+def hours_by_type(cube: Dict[str, Any], selected_date, craft: str | None = None) -> pd.DataFrame:
+    """Look up hours by work order type for one date, and one craft if given.
+
+    Returns a frame with ``Type``, ``hours`` and ``percent`` columns sorted
+    by hours descending (the breakdown shown on every summary)."""
+    if craft is None:
+        rows = cube["by_date_rows"].get(selected_date, np.array([], dtype=np.intp))
+        agg = cube["by_date"].iloc[rows][["Type", "hours"]]
+    else:
+        rows = cube["by_craft_rows"].get((selected_date, craft), np.array([], dtype=np.intp))
+        agg = cube["by_craft"].iloc[rows][["Type", "hours"]]
+    return _breakdown(agg)
+
+def prepare_range_report(
+    time_df: pd.DataFrame,
+    addr_df: pd.DataFrame,
+    craft_order_df: pd.DataFrame,
+    start,
+    end,
+    index: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Prepare a summary report of hours from ``start`` to ``end`` (inclusive).
+
+    The range is found by binary search over the cube's sorted dates and the
+    totals are differences of the cube's cumulative sums, so a long range
+    costs about the same as one day.  Range reports summarize hours only;
+    they carry no detail rows.
+
+    Returns a dictionary with keys:
+      - ``groups``: a list of tuples (craft_name, payload) in craft order where
+        payload contains the craft's ``hours_by_type`` over the range.
+      - ``hours_by_type``: hours by work order type over the range.
+      - ``daily``: hours per day (rows) and craft (columns) for the trend.
+      - ``dates``: the dates in the range that have data.
+    """
+    if index is None:
+        index = index_time_data(time_df, addr_df)
+    cube = index["cube"]
+    days = cube["days"]
+    lo = np.searchsorted(days, np.datetime64(start, "D"), side="left")
+    hi = np.searchsorted(days, np.datetime64(end, "D"), side="right")
+    # Every summed value has 2 decimals; rounding drops the float noise the
+    # subtraction leaves behind.
+    hours = (cube["cum_hours"][hi] - cube["cum_hours"][lo]).round(2)
+    present = (cube["cum_rows"][hi] - cube["cum_rows"][lo]) > 0
+    totals = cube["range_keys"].assign(hours=hours)[present]
+
+    groups_payload: List = []
+    for craft in _craft_categories(craft_order_df):
+        craft_totals = totals[totals["Craft Description"] == craft]
+        if not craft_totals.empty:
+            groups_payload.append((craft, {"hours_by_type": _breakdown(craft_totals[["Type", "hours"]])}))
+    overall = totals.groupby("Type", dropna=False)["hours"].sum().reset_index()
+
+    row_lo = np.searchsorted(cube["by_craft_days"], np.datetime64(start, "D"), side="left")
+    row_hi = np.searchsorted(cube["by_craft_days"], np.datetime64(end, "D"), side="right")
+    daily = (
+        cube["by_craft"]
+        .iloc[row_lo:row_hi]
+        .groupby(["Production Date", "Craft Description"])["hours"]
+        .sum()
+        .unstack(fill_value=0.0)
+    )
+    daily.index = [_date_key(d) for d in daily.index]
+    return {
+        "groups": groups_payload,
+        "hours_by_type": _breakdown(overall),
+        "daily": daily,
+        "dates": [_date_key(pd.Timestamp(d)) for d in days[lo:hi]],
+    }
+
+def index_time_data(time_df: pd.DataFrame, addr_df: pd.DataFrame) -> Dict[str, Any]:
+    """Join the address book onto the time data once and partition the rows by
+    production date.
+
+    ``addr_df`` is not modified.  Returns a dictionary with keys:
+      - ``frame``: the time data with ``Craft Description`` from the address book
+        and missing names filled from it.
+      - ``date_rows``: a mapping of production date to the row positions in
+        ``frame`` for that date, in their original order.
+      - ``cube``: the hours cube from ``build_hours_cube``.
+      - ``unmapped``: a boolean array marking the rows of ``frame`` whose
+        AddressBookNumber has no craft in the address book.
+    """
+    lookup = compile_address_book(addr_df)
+    merged = time_df.copy()
+    with span("merge"):
+        numbers = merged["AddressBookNumber"]
+        if not isinstance(numbers.dtype, pd.CategoricalDtype) and numbers.dtype != object:
+            # Cleaned frames hold the numbers as stripped strings already.
+            numbers = merged["AddressBookNumber"] = numbers.astype(str).str.strip()
+        positions = _address_book_positions(numbers, lookup)
+        crafts = lookup["crafts"].take(positions)
+        merged["Craft Description"] = crafts
+        names = merged["Name"]
+        book_names = pd.Series(lookup["names"].take(positions), index=merged.index)
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            missing_names = pd.Index(book_names.dropna().unique()).difference(names.cat.categories)
+            names = names.cat.add_categories(missing_names)
+        merged["Name"] = names.fillna(book_names)
+        unmapped = pd.isna(crafts)
+    with span("date index"):
+        date_rows = merged.groupby("Production Date", sort=False).indices
+        if pd.api.types.is_datetime64_any_dtype(merged["Production Date"]):
+            # Compact frames store datetime64 dates; reports are looked up by date.
+            date_rows = {pd.Timestamp(d).date(): rows for d, rows in date_rows.items()}
+    with span("cube"):
+        cube = build_hours_cube(merged)
+    return {"frame": merged, "date_rows": date_rows, "cube": cube, "unmapped": unmapped}
+
+def prepare_report_data(
+    time_df: pd.DataFrame,
+    addr_df: pd.DataFrame,
+    craft_order_df: pd.DataFrame,
+    selected_date,
+    index: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Prepare the report data for the selected production date.
+
+    ``index`` is the result of ``index_time_data`` for ``time_df`` and
+    ``addr_df``.  Pass it when preparing several dates from the same data so
+    the address book join and date partitioning are only done once; it is
+    built on the fly when omitted.
+
+    Returns a dictionary with keys:
+      - ``groups``: a list of tuples (craft_name, payload) where payload contains a
+        'detail' DataFrame with the selected columns.
+      - ``full_detail``: the complete filtered DataFrame of selected columns.
+      - ``unmapped_people``: a list of address book entries that could not be mapped.
+      - ``hours_by_type``: the day's hours by work order type from the cube.
+    Each payload also carries the craft's ``hours_by_type``.
+    """
+    if index is None:
+        index = index_time_data(time_df, addr_df)
+    rows = index["date_rows"].get(selected_date, np.array([], dtype=np.intp))
+    merged = index["frame"].take(rows).reset_index(drop=True)
+    # A day's rows are few, so compact columns go back to plain objects and
+    # float64 here and the rest of the report code sees the usual types.
+    # float32 hours are rounded to 4 decimals on the way back so they round
+    # to 2 decimals below exactly as the value in the workbook would.
+    for col in merged.columns:
+        if isinstance(merged[col].dtype, pd.CategoricalDtype):
+            merged[col] = merged[col].astype(object)
+        elif merged[col].dtype == np.float32:
+            merged[col] = merged[col].astype(np.float64).round(4)
+    # Identify unmapped people
+    unmapped: List[Dict[str, Any]] = []
+    mask_unmapped = index["unmapped"][rows]
+    if mask_unmapped.any():
+        unmapped = (
+            merged.loc[mask_unmapped, ["AddressBookNumber", "Name"]]
+            .drop_duplicates()
+            .to_dict("records")
+        )
+    merged.loc[mask_unmapped, "Craft Description"] = "Unassigned"
+    merged = _apply_craft_category(merged, craft_order_df)
+    # === Custom: Ensure 'CC' is populated after merge (fallback to 'CostCenter' if needed) ===
+    try:
+        if "CC" not in merged.columns or merged["CC"].isna().all():
+            if "CostCenter" in merged.columns:
+                merged["CC"] = merged["CostCenter"].astype(str).fillna("").str.strip().replace({"nan": ""})
+    except Exception:
+        pass
+    # === End Custom ===
+
+    # Ensure display columns exist
+    for col in DISPLAY_COLUMNS:
+        if col not in merged.columns:
+            merged[col] = pd.NA
+    merged["Type"] = _map_types(merged["Type"])
+    merged = merged.sort_values(["Craft Description", "Name", "Work Order #"])
+    merged["Sum of Hours"] = pd.to_numeric(merged["Sum of Hours"], errors="coerce").round(2)
+    full_detail = merged[DISPLAY_COLUMNS].copy()
+    # The rows are sorted by craft, so each craft is a contiguous block of
+    # ``full_detail``.  One groupby pass finds the blocks and each payload is a
+    # row slice of ``full_detail`` rather than a filtered copy.  Ordering by
+    # the first row of each block keeps the CRAFT_ORDER category order.
+    groups_payload: List = []
+    cube = index["cube"]
+    with span("group"):
+        positions = full_detail.groupby(merged["Craft Description"], observed=True, sort=False).indices
+        for craft, rows in sorted(positions.items(), key=lambda item: item[1][0]):
+            payload = {
+                "detail": full_detail.iloc[rows[0] : rows[-1] + 1],
+                "hours_by_type": hours_by_type(cube, selected_date, str(craft)),
+            }
+            groups_payload.append((str(craft), payload))
+    return {
+        "groups": groups_payload,
+        "full_detail": full_detail,
+        "unmapped_people": unmapped,
+        "hours_by_type": hours_by_type(cube, selected_date),
+    }
@@ -0,0 +1,237 @@
+"""SQLite history of uploaded Time on Work Order exports.
+
+``HistoryStore`` keeps the cleaned rows of every export it is given.  Dates
+already in the store are replaced as a whole when an export changes them, so
+re-exported days are updated rather than duplicated, and dates whose rows
+are unchanged are not written at all.  The rows are indexed by Production
+Date, AddressBookNumber and Work Order #, so earlier dates and cross-day
+queries are served without the original workbooks.
+
+Crafts are not stored: a query assigns each row the craft the report would
+(its address book craft, or "Unassigned") from the address book current at
+query time, so a reloaded address book (see ``reference``) applies to saved
+dates as well.
+
+Each call opens its own connection, so one store can be shared between
+threads (for example Streamlit sessions).
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .data import _address_book_positions, _date_key, compile_address_book, get_address_book_df
+from .incremental import _classify_dates, _digests_version, date_digests
+
+# ``rows`` is created with the indexed columns; the other columns of the
+# cleaned frame are added as exports bring them.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    "Production Date" TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    "Production Date" TEXT NOT NULL,
+    "AddressBookNumber" TEXT,
+    "Work Order #" TEXT
+);
+CREATE INDEX IF NOT EXISTS rows_date ON rows ("Production Date");
+DROP INDEX IF EXISTS rows_craft;
+CREATE INDEX IF NOT EXISTS rows_person ON rows ("AddressBookNumber", "Production Date");
+CREATE INDEX IF NOT EXISTS rows_work_order ON rows ("Work Order #");
+"""
+
+# Scalar types sqlite3 binds as they are, and the inferred dtypes of columns
+# holding nothing else.
+_SQL_NATIVE = (bool, int, float, str, bytes)
+_SQL_NATIVE_DTYPES = {"empty", "boolean", "integer", "floating", "mixed-integer-float", "string", "bytes"}
+
+def default_history_path() -> Path | None:
+    """Return the history database named by ``WORKORDER_EXPORT_HISTORY``, if set."""
+    env = os.environ.get("WORKORDER_EXPORT_HISTORY")
+    return Path(env) if env else None
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _sql_values(column: pd.Series) -> List[Any]:
+    """Return a column as values SQLite stores natively: Python scalars,
+    ISO dates and None for missing values.  Other values (times, decimals
+    and so on) are stored as their string form."""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        column = column.dt.date
+    values = column.astype(object).where(column.notna(), None).tolist()
+    if pd.api.types.infer_dtype(column, skipna=True) in _SQL_NATIVE_DTYPES:
+        return values
+    return [
+        v if v is None or type(v) in _SQL_NATIVE else v.isoformat() if isinstance(v, date) else str(v)
+        for v in values
+    ]
+
+def _craft_filter(lookup: Dict[str, Any], crafts: Iterable[str]) -> tuple[str, List[str]]:
+    """Return a WHERE clause and its parameters selecting the rows the
+    address book ``lookup`` assigns to ``crafts``."""
+    crafts = {str(c) for c in crafts}
+    book_crafts = pd.Series(lookup["crafts"][:-1], dtype=object)
+    numbers = lookup["numbers"][book_crafts.isin(crafts).to_numpy()].tolist()
+    clauses = [f'"AddressBookNumber" IN ({", ".join("?" * len(numbers))})'] if numbers else []
+    if "Unassigned" in crafts:
+        # People missing from the address book, or listed without a craft.
+        listed = lookup["numbers"][book_crafts.notna().to_numpy()].tolist()
+        clauses.append(
+            f'("AddressBookNumber" IS NULL OR "AddressBookNumber" NOT IN ({", ".join("?" * len(listed))}))'
+        )
+        numbers = numbers + listed
+    return (f"({' OR '.join(clauses)})" if clauses else "0"), numbers
+
+class HistoryStore:
+    """Cleaned time rows of past exports in an SQLite database at ``path``."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    def _columns(self, con: sqlite3.Connection) -> List[str]:
+        return [r[1] for r in con.execute("PRAGMA table_info(rows)")]
+
+    def digests(self) -> Dict[date, str]:
+        """Return the stored digest of each Production Date."""
+        with closing(self._connect()) as con:
+            rows = con.execute('SELECT "Production Date", digest FROM days').fetchall()
+        return {date.fromisoformat(d): digest for d, digest in rows}
+
+    @property
+    def version(self) -> str:
+        """A key that changes whenever any date in the store changes."""
+        return _digests_version(self.digests())
+
+    def dates(self) -> List[date]:
+        """Return the stored Production Dates in order."""
+        return sorted(self.digests())
+
+    def save(self, time_df: pd.DataFrame) -> Dict[str, List[date]]:
+        """Store the rows of a cleaned export, replacing the dates it changes.
+
+        New and changed dates are written in one transaction; unchanged dates
+        are skipped.
+
+        :return: A dictionary with sorted lists of ``added``, ``updated`` and
+            ``unchanged`` dates, as from ``IncrementalStore.merge``.
+        """
+        incoming = date_digests(time_df)
+        result = _classify_dates(incoming, self.digests())
+        changed = set(result["added"]) | set(result["updated"])
+        if not changed:
+            return result
+
+        frame = time_df.drop(columns=["Craft Description"], errors="ignore")
+        day_keys = frame["Production Date"].map(_date_key)
+        frame = frame[day_keys.isin(changed)]
+        day_keys = day_keys[frame.index]
+        counts = day_keys.value_counts()
+
+        columns = list(frame.columns)
+        records = list(zip(*(_sql_values(frame[c]) for c in columns)))
+        now = time.time()
+        with closing(self._connect()) as con:
+            with con:
+                existing = set(self._columns(con))
+                for col in columns:
+                    if col not in existing:
+                        con.execute(f"ALTER TABLE rows ADD COLUMN {_quote(col)}")
+                iso = [(d.isoformat(),) for d in sorted(changed)]
+                con.executemany('DELETE FROM rows WHERE "Production Date" = ?', iso)
+                con.executemany(
+                    f"INSERT INTO rows ({', '.join(map(_quote, columns))}) VALUES ({', '.join('?' * len(columns))})",
+                    records,
+                )
+                con.executemany(
+                    'INSERT INTO days ("Production Date", digest, row_count, updated_at) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT ("Production Date") DO UPDATE SET '
+                    "digest = excluded.digest, row_count = excluded.row_count, updated_at = excluded.updated_at",
+                    [(d.isoformat(), incoming[d], int(counts.get(d, 0)), now) for d in sorted(changed)],
+                )
+        return result
+
+    def query(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        crafts: Iterable[str] | None = None,
+        address_book_numbers: Iterable[str] | None = None,
+        work_orders: Iterable[str] | None = None,
+        addr_df: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """Return the stored rows matching every given filter, with their
+        ``Craft Description``, by date and in stored order within a date.
+
+        :param start: First Production Date (inclusive).
+        :param end: Last Production Date (inclusive).
+        :param crafts: Only rows assigned to these crafts.
+        :param address_book_numbers: Only rows of these people.
+        :param work_orders: Only rows booked to these work orders.
+        :param addr_df: Address book used to assign the crafts.  Defaults to
+            the current address book.
+        """
+        lookup = compile_address_book(addr_df if addr_df is not None else get_address_book_df())
+        where: List[str] = []
+        params: List[Any] = []
+        if start is not None:
+            where.append('"Production Date" >= ?')
+            params.append(start.isoformat())
+        if end is not None:
+            where.append('"Production Date" <= ?')
+            params.append(end.isoformat())
+        if crafts is not None:
+            clause, values = _craft_filter(lookup, crafts)
+            where.append(clause)
+            params.extend(values)
+        for column, values in (
+            ("AddressBookNumber", address_book_numbers),
+            ("Work Order #", work_orders),
+        ):
+            if values is not None:
+                values = [str(v) for v in values]
+                where.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})" if values else "0")
+                params.extend(values)
+        sql = "SELECT * FROM rows" + (f" WHERE {' AND '.join(where)}" if where else "")
+        sql += ' ORDER BY "Production Date", rowid'
+        with closing(self._connect()) as con:
+            cursor = con.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        # Databases written before crafts were assigned at query time still
+        # carry a stored craft column.
+        df = df.drop(columns=["Craft Description"], errors="ignore")
+        df["Production Date"] = pd.Series(
+            [date.fromisoformat(d) for d in df["Production Date"]], index=df.index, dtype=object
+        )
+        for col in df.columns:
+            if df[col].dtype == object:
+                # NULLs come back as None; cleaned frames mark missing text with NaN.
+                df[col] = df[col].where(df[col].notna(), np.nan)
+        numbers = df["AddressBookNumber"].astype(str).str.strip()
+        assigned = lookup["crafts"].take(_address_book_positions(numbers, lookup))
+        df["Craft Description"] = pd.Series(assigned, index=df.index, dtype=object).fillna("Unassigned")
+        return df
+
+    def load(self, start: date | None = None, end: date | None = None) -> pd.DataFrame:
+        """Return the stored rows from ``start`` to ``end`` as a cleaned time
+        frame, ready for ``index_time_data`` and ``prepare_report_data``."""
+        return self.query(start, end).drop(columns=["Craft Description"])
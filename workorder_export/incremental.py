@@ -0,0 +1,123 @@
+"""Incremental merging of overlapping rolling exports.
+
+Each day's Time on Work Order export repeats the previous N days and adds
+today.  ``IncrementalStore`` keeps the accumulated cleaned rows and a digest
+of each Production Date, so merging a new upload only replaces the dates
+whose rows actually changed and tells the caller which reports need to be
+prepared and rendered again.
+"""
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .cache import content_hash, read_arrow, write_arrow
+
+# Rows are identified and ordered by these columns.  They are not unique on
+# their own (one person can book several entries to the same work order on a
+# day), so a date's digest covers every column of every row for that date.
+STORE_KEY: List[str] = ["Production Date", "AddressBookNumber", "Work Order #"]
+
+def date_digests(time_df: pd.DataFrame) -> Dict[date, str]:
+    """Return a digest of the rows for each Production Date in ``time_df``.
+
+    Values are hashed through their string form so a frame read back from
+    the on-disk cache digests the same as a freshly parsed one.  Row hashes
+    are summed per date, so the digest does not depend on row order.
+    """
+    dates = time_df["Production Date"]
+    valid = dates.notna().to_numpy()
+    if not valid.any():
+        return {}
+    cols = sorted(time_df.columns, key=str)
+    row_hashes = pd.util.hash_pandas_object(time_df[cols].astype(str), index=False).to_numpy()[valid]
+    codes, uniques = pd.factorize(dates[valid])
+    if isinstance(uniques, pd.DatetimeIndex):
+        # Compact frames store datetime64 dates; the store is keyed by date.
+        uniques = uniques.date
+    sums = np.zeros(len(uniques), dtype=np.uint64)
+    np.add.at(sums, codes, row_hashes)
+    counts = np.bincount(codes, minlength=len(uniques))
+    return {d: f"{n}-{s:016x}" for d, n, s in zip(uniques, counts, sums)}
+
+def _classify_dates(incoming: Dict[date, str], stored: Dict[date, str]) -> Dict[str, List[date]]:
+    """Split the dates of ``incoming`` digests by how they compare with the
+    ``stored`` digests: sorted lists of ``added``, ``updated`` and
+    ``unchanged`` dates."""
+    return {
+        "added": sorted(d for d in incoming if d not in stored),
+        "updated": sorted(d for d in incoming if d in stored and stored[d] != incoming[d]),
+        "unchanged": sorted(d for d in incoming if stored.get(d) == incoming[d]),
+    }
+
+def _digests_version(digests: Dict[date, str]) -> str:
+    """Return a key that changes whenever any of ``digests`` changes."""
+    items = "\n".join(f"{d}:{digest}" for d, digest in sorted(digests.items()))
+    return content_hash(items.encode())
+
+def _in_dates(time_df: pd.DataFrame, dates: set) -> pd.Series:
+    """Return which rows of ``time_df`` have a Production Date in ``dates``."""
+    column = time_df["Production Date"]
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.normalize().isin([pd.Timestamp(d) for d in dates])
+    return column.isin(dates)
+
+def _with_date_objects(time_df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``time_df`` with a datetime64 Production Date turned into
+    ``date`` objects, so compact and default frames share one store."""
+    column = time_df["Production Date"]
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return time_df.assign(**{"Production Date": column.dt.date})
+    return time_df
+
+class IncrementalStore:
+    """Accumulated time data from overlapping exports, replaced date by date."""
+
+    def __init__(self) -> None:
+        self.frame = pd.DataFrame()
+        self.digests: Dict[date, str] = {}
+
+    @property
+    def version(self) -> str:
+        """A key that changes whenever any date in the store changes."""
+        return _digests_version(self.digests)
+
+    def merge(self, time_df: pd.DataFrame) -> Dict[str, List[date]]:
+        """Merge a newly uploaded cleaned frame into the store.
+
+        Every Production Date in ``time_df`` is compared with the stored
+        rows for that date.  New and changed dates replace the stored rows;
+        dates only present in the store are kept.
+
+        :return: A dictionary with sorted lists of ``added``, ``updated`` and
+            ``unchanged`` dates.
+        """
+        incoming = date_digests(time_df)
+        result = _classify_dates(incoming, self.digests)
+        changed = set(result["added"]) | set(result["updated"])
+        if changed:
+            keep = self.frame[~_in_dates(self.frame, changed)] if not self.frame.empty else self.frame
+            keep = _with_date_objects(keep) if not keep.empty else keep
+            new_rows = _with_date_objects(time_df[_in_dates(time_df, changed)])
+            frame = pd.concat([keep, new_rows], ignore_index=True) if not keep.empty else new_rows
+            ordered = frame.sort_values(STORE_KEY, kind="stable", key=lambda col: col.astype(str))
+            self.frame = ordered.reset_index(drop=True)
+            for d in changed:
+                self.digests[d] = incoming[d]
+        return result
+
+    def save(self, path: str | Path) -> None:
+        """Write the store to an Arrow file at ``path``."""
+        write_arrow(path, self.frame)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IncrementalStore":
+        """Read a store written by ``save``.  A missing file gives an empty store."""
+        store = cls()
+        frame = read_arrow(path) if Path(path).exists() else None
+        if frame is not None and not frame.empty:
+            store.frame = frame
+            store.digests = date_digests(frame)
+        return store
@@ -0,0 +1,135 @@
+"""Hard-coded craft order, address book and work order type mappings."""
+from typing import Dict, List
+
+# ---- Hard-coded mappings (from your uploaded files at build time) ----
+CRAFT_ORDER = [
+    "MS Turns",
+    "EAF Mech Days",
+    "EAF Elec Days",
+    "AOD Mech Days",
+    "AOD Elec Days",
+    "Alloy Mech Days",
+    "Caster Mech Days",
+    "Caster Elec Days",
+    "WTP Mech Days",
+    "Baghouse Mech Days",
+    "Preheater Elec Days",
+    "Segment Shop",
+    "Utilities Mech Days",
+    "HVAC Elec Days",
+]
+
+# Address book mapping of employee numbers to name and craft description.
+# This data is embedded so the application works without external dependencies.
+ADDRESS_BOOK = [
+    {"AddressBookNumber": "1103079", "Name": "CONKEL, JOHNATHON J", "Craft Description": "Alloy Mech Days"},
+    {"AddressBookNumber": "817150", "Name": "PETERS, JESSE DANIEL", "Craft Description": "AOD Elec Days"},
+    {"AddressBookNumber": "648991", "Name": "JONES, TERRELL D.", "Craft Description": "AOD Elec Days"},
+    {"AddressBookNumber": "136792", "Name": "MCKINNEY, CHRIS ALVIE", "Craft Description": "AOD Mech Days"},
+    {"AddressBookNumber": "1142730", "Name": "CHRISTERSON, NATHANIEL BENJAMEN", "Craft Description": "Baghouse Mech Days"},
+    {"AddressBookNumber": "1150094", "Name": "WRIGHT, KEVIN BRADLEY", "Craft Description": "Baghouse Mech Days"},
+    {"AddressBookNumber": "1064305", "Name": "DALTON II, JEFFERY WAYNE", "Craft Description": "Caster Elec Days"},
+    {"AddressBookNumber": "1115109", "Name": "GANDER, ANTHONY T", "Craft Description": "Caster Elec Days"},
+    {"AddressBookNumber": "1055943", "Name": "HEFFELMIRE, RONALD SCOTT", "Craft Description": "Caster Mech Days"},
+    {"AddressBookNumber": "1112813", "Name": "KOONS, ANDREW LEWIS ALAN", "Craft Description": "Caster Mech Days"},
+    {"AddressBookNumber": "95636", "Name": "MORRISON, GEORGE D.", "Craft Description": "Caster Mech Days"},
+    {"AddressBookNumber": "586013", "Name": "DENNIS, SHAWN MICHAEL", "Craft Description": "EAF Elec Days"},
+    {"AddressBookNumber": "1137121", "Name": "STEWART, THOMAS JASON", "Craft Description": "EAF Mech Days"},
+    {"AddressBookNumber": "1106595", "Name": "WASH, MICHAEL DAVID", "Craft Description": "EAF Mech Days"},
+    {"AddressBookNumber": "178909", "Name": "LEMASTER, DANIEL M.", "Craft Description": "HVAC Elec Days"},
+    {"AddressBookNumber": "1115133", "Name": "BROCK, TREVOR COLE", "Craft Description": "Preheater Elec Days"},
+    {"AddressBookNumber": "133760", "Name": "BRIGHTWELL, JEFFERY W.", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "173665", "Name": "CRAIG, JAMES D.", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "336719", "Name": "DEEN, ALAN J.", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "1151409", "Name": "DEMAREE, MATTHEW CHRISTOPHER", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "848802", "Name": "KLOSS, CHARLES W.", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "95644", "Name": "SMITH, JAMES M.", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "1104469", "Name": "WATSON, JACOB LEYTON", "Craft Description": "Segment Shop"},
+    {"AddressBookNumber": "1103976", "Name": "BAUGHMAN, THOMAS BRUCE", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1066095", "Name": "HELTON, MICHAEL AJ", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "44231", "Name": "REED, BRIAN L.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1167030", "Name": "STROUD, MATTHEW T.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "164380", "Name": "WARREN, MARK L.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "185050", "Name": "WHOBREY, BRADLEY G.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1103132", "Name": "WILLIAMS II, STEVEN FOSTER", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1106747", "Name": "BANTA, BENJAMIN GAYLE", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1165384", "Name": "BOHART, WILLIAM M.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1144250", "Name": "CAREY, JOSEPH MICHAEL", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "770363", "Name": "CORMAN, DAVID H.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1149608", "Name": "DIEDERICH, JOSEPH W", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "193471", "Name": "GRAY, DENNIS C.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "109866", "Name": "HOWARD, LARRY D.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1141761", "Name": "PHILLIPS, TIMOTHY CRAIG RYAN", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "272006", "Name": "SEE, JOHN JOURDAN", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "106260", "Name": "SPILLMAN, WILLIAM H.", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1131299", "Name": "STEWART, BRADFORD LEE", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1109876", "Name": "STOKES, MATHEW DAVID", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "234448", "Name": "THOMAS, CODY JORDAN", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1107352", "Name": "WATKINS, KENNETH EDWARD", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "1096665", "Name": "ATWELL, TALON BRADLEY", "Craft Description": "MS Turns"},
+    {"AddressBookNumber": "108986", "Name": "ROGERS, CHARLES D.", "Craft Description": "Utilities Mech Days"},
+    {"AddressBookNumber": "206092", "Name": "TURNER, SHANE M.", "Craft Description": "Utilities Mech Days"},
+    {"AddressBookNumber": "1089377", "Name": "ROSE, CAMERON CHASE", "Craft Description": "WTP Mech Days"},
+]
+
+# Mapping from work order type codes to descriptive names.
+TYPE_MAP: Dict[str, str] = {
+    "0": "Break In",
+    "1": "Standard Corrective",
+    "2": "Material Repair TMJ Order",
+    "3": "Capital Project",
+    "4": "Urgent Corrective",
+    "5": "Emergency Order",
+    "6": "PM Restore/Replace",
+    "7": "PM Inspection",
+    "8": "Follow Up Work Order",
+    "9": "Standing W.O. - Do not Delete",
+    "B": "Marketing",
+    "C": "Cost Improvement",
+    "D": "Design Work - ETO",
+    "E": "Plant Work - ETO",
+    "G": "Governmental/Regulatory",
+    "M": "Model W.O. - Eq Mgmt",
+    "N": "Template W.O. - CBM Alerts",
+    "P": "Project",
+    "R": "Rework Order",
+    "S": "Shop Order",
+    "T": "Tool Order",
+    "W": "Case",
+    "X": "General Work Request",
+    "Y": "Follow Up Work Request",
+    "Z": "System Work Request",
+}
+
+# Columns used for display and included in the PDF and data downloads.
+DISPLAY_COLUMNS: List[str] = ["Name", "Work Order #", "Sum of Hours", "Type", "CostCenter", "Description", "Problem"]
+
+# Columns expected in the uploaded Excel export.  If any are missing they will be
+# created with missing values.
+REQUIRED_TIME_COLUMNS: List[str] = ["AddressBookNumber", "Name", "Production Date", "OrderNumber", "Sum of Hours.", "Hours Estimated", "Status", "Type", "PMFrequency", "Description", "Problem", "Department", "Location", "Equipment", "PM Number", "PM", "CostCenter"]
+
+# Fixed relative widths for each of the seven columns of the PDF detail
+# tables.  These values sum to 1.0 and correspond to the column order produced
+# by ``_df_for_pdf``: Name, Work Order #, Sum of Hours, Type, CC, Description,
+# Problem.  Column widths have been updated per user request:
+#   Name          : 18% (0.18)
+#   Work Order #  : 6%  (0.06)
+#   Sum of Hours  : 5%  (0.05)
+#   Type          : 14% (0.14)
+#   CC            : 3%  (0.03)
+#   Description   : 17% (0.17)
+#   Problem       : 37% (0.37)
+PDF_COLUMN_WIDTHS: List[float] = [0.18, 0.06, 0.05, 0.14, 0.03, 0.17, 0.37]
+
+# Colors for work order types, shared by the dashboard charts and tables and
+# the PDF export.
+TYPE_COLORS: Dict[str, str] = {
+    "Break In": "#d62728",
+    "Standard Corrective": "#1f77b4",
+    "Urgent Corrective": "#ff7f0e",
+    "Emergency Order": "#d62728",
+    "PM Restore/Replace": "#2ca02c",
+    "PM Inspection": "#2ca02c",
+    "Follow Up Work Order": "#d4c720",
+    "Project": "#9467bd",
+}
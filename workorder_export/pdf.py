@@ -0,0 +1,966 @@
+"""PDF export of the daily report.
+
+Pages are rendered with matplotlib (the default backend) or ReportLab.  Both
+are imported inside the functions that render, so importing this module does
+not pay for either library until a PDF is actually built.
+"""
+from __future__ import annotations
+
+import functools
+import io
+import logging
+import textwrap
+import time
+from typing import TYPE_CHECKING, Any, Dict, List
+from xml.sax.saxutils import escape as _xml_escape
+
+import numpy as np
+import pandas as pd
+
+from .mappings import PDF_COLUMN_WIDTHS, TYPE_COLORS
+from .timing import active_timings, span
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+logger = logging.getLogger(__name__)
+
+def _df_for_pdf(df: pd.DataFrame) -> pd.DataFrame:
+    """Format numeric columns for inclusion in the PDF."""
+    out = df.copy()
+    # Format "Sum of Hours" as a string with two decimal places.  Convert to
+    # numeric first so non-numeric values become NaN and then to formatted
+    # string.  Leave as-is if missing.
+    if "Sum of Hours" in out.columns:
+        out["Sum of Hours"] = (
+            pd.to_numeric(out["Sum of Hours"], errors="coerce")
+            .fillna(0)
+            .map(lambda x: f"{x:.2f}")
+        )
+    # Normalize cost center column for the PDF.  If a column named "CC" is
+    # missing but "CostCenter" exists, rename it to "CC".  If both exist
+    # concurrently, prefer the existing "CC" column and drop "CostCenter".
+    if "CC" not in out.columns:
+        if "CostCenter" in out.columns:
+            out = out.rename(columns={"CostCenter": "CC"})
+    else:
+        # Drop any redundant CostCenter column when CC is present
+        if "CostCenter" in out.columns:
+            out = out.drop(columns=["CostCenter"])
+    # Reorder columns to ensure a consistent layout in the PDF.  Include the
+    # cost center (CC) column between Type and Description.
+    desired_order = [
+        "Name",
+        "Work Order #",
+        "Sum of Hours",
+        "Type",
+        "CC",
+        "Description",
+        "Problem",
+    ]
+    # Filter out columns not present and drop duplicates if any
+    order = [col for col in desired_order if col in out.columns]
+    out = out[order]
+    return out
+
+# -----------------------------------------------------------------------------
+# PDF helper functions
+#
+# The following helpers render figures for the PDF export.  To more closely
+# mirror the Streamlit dashboard layout, each craft will have a summary page
+# containing the bar chart of hours by work order type, some key metrics,
+# and a breakdown table.  Additional pages are then added for the detailed
+# work order table, splitting the rows across multiple pages as needed.  These
+# helpers return matplotlib Figure objects which the main ``build_pdf``
+# function writes to the PdfPages instance.
+def _hours_by_type(df_detail: pd.DataFrame) -> tuple[pd.DataFrame, float]:
+    """Aggregate hours by work order type for a summary page.
+
+    Returns the breakdown with ``Type``, ``hours`` and ``percent`` columns,
+    sorted by hours descending, together with the total hours."""
+    df = df_detail.copy()
+    df["Sum of Hours"] = pd.to_numeric(df["Sum of Hours"], errors="coerce").fillna(0.0)
+    agg = (
+        df.groupby("Type", dropna=False)["Sum of Hours"]
+        .sum()
+        .reset_index()
+        .rename(columns={"Sum of Hours": "hours"})
+        .sort_values("hours", ascending=False)
+    )
+    total = float(agg["hours"].sum())
+    agg["percent"] = np.where(total > 0, (agg["hours"] / total) * 100.0, 0.0)
+    return agg, total
+
+def _overall_breakdown(report: Dict[str, Any]) -> pd.DataFrame | None:
+    """Return the breakdown for the overall summary page, or None when the
+    report has no hours to summarize."""
+    full_detail = report.get("full_detail")
+    breakdown = report.get("hours_by_type")
+    if isinstance(full_detail, pd.DataFrame) and not full_detail.empty:
+        return _summary_breakdown(full_detail, breakdown)
+    if isinstance(breakdown, pd.DataFrame) and not breakdown.empty:
+        return breakdown
+    return None
+
+def _summary_breakdown(df_detail: pd.DataFrame, breakdown: pd.DataFrame | None) -> pd.DataFrame:
+    """Return the hours-by-type breakdown looked up from the hours cube by
+    ``prepare_report_data``, or aggregate ``df_detail`` for reports built
+    without one."""
+    if breakdown is not None:
+        return breakdown
+    return _hours_by_type(df_detail)[0]
+
+def _create_summary_figure(agg: pd.DataFrame, craft_name: str, max_type_count: int | None = None) -> plt.Figure:
+    """
+    Create a summary figure for a single craft.  The layout consists of a bar
+    chart showing hours by work order type, a metrics text block, and a
+    breakdown table of hours and percentages by type.  This attempts to
+    approximate the Streamlit dashboard view.
+
+    :param agg: Hours by work order type with 'Type', 'hours' and 'percent'
+        columns, sorted by hours descending.
+    :param craft_name: Name of the craft group.
+    :return: A matplotlib Figure ready for saving to the PDF.
+    """
+    import matplotlib.pyplot as plt
+
+    total = float(agg["hours"].sum())
+    top_type = agg.iloc[0]["Type"] if not agg.empty else "-"
+    top_pct = agg.iloc[0]["percent"] if not agg.empty else 0.0
+
+    # Create figure and axes using a grid layout
+    fig = plt.figure(figsize=(11, 8.5))
+    fig.suptitle(f"{craft_name} — Summary", fontsize=16, y=0.98)
+    # Bar chart axis occupies the left portion of the page
+    ax_bar = fig.add_axes([0.05, 0.35, 0.55, 0.5])
+    default_color = "#333333"
+    colors_list = []
+    for t in agg["Type"]:
+        if isinstance(t, str):
+            colors_list.append(TYPE_COLORS.get(str(t), default_color))
+        else:
+            colors_list.append(default_color)
+    # Render bars with a fixed width so a single bar does not occupy the
+    # entire chart width.  Positions are spaced uniformly along the x-axis.
+    positions = np.arange(len(agg))
+    # Use a fixed bar width so that bars retain the same thickness regardless
+    # of how many categories are present.  A value less than 1.0 ensures
+    # spacing between bars when the number of categories is small.  Add a thin
+    # black outline around each bar for visual separation.
+    bar_width = 0.8
+    ax_bar.bar(
+        positions,
+        agg["hours"],
+        color=colors_list,
+        width=bar_width,
+        edgecolor="black",
+        linewidth=0.5,
+    )
+    # If a maximum type count is supplied, fix the x-axis limits so that the
+    # bar chart maintains the same overall width across different groups.  When
+    # fewer types are present than ``max_type_count``, additional empty
+    # positions ensure the bars do not stretch to fill the axis.  If not
+    # provided, the x-axis will scale automatically.
+    if max_type_count is not None:
+        try:
+            max_val = int(max_type_count)
+        except Exception:
+            max_val = len(agg)
+        # Ensure the axis accommodates at least the number of actual categories
+        max_val = max(max_val, len(agg))
+        ax_bar.set_xlim(-0.5, max_val - 0.5)
+    ax_bar.set_xticks(positions)
+    ax_bar.set_xticklabels(agg["Type"].astype(str), rotation=45, fontsize=8)
+    ax_bar.set_title("Hours by Work Order Type", fontsize=12)
+    ax_bar.set_xlabel("Type")
+    ax_bar.set_ylabel("Hours")
+    # Add horizontal margins to avoid bars touching the axes
+    ax_bar.margins(x=0.15)
+    # Reposition metrics to the right side above the breakdown table to avoid overlap
+    fig.text(0.65, 0.82, f"Total Hours: {total:,.2f}", fontsize=10, va="top")
+    fig.text(0.65, 0.79, f"Top Type: {top_type}", fontsize=10, va="top")
+    fig.text(0.65, 0.76, f"% in Top Type: {top_pct:.1f}%", fontsize=10, va="top")
+    # Breakdown table axis occupies the right portion below the metrics
+    # Allocate the breakdown table to the lower half of the right side.  Using a height
+    # of 0.4 (from 0.35 to 0.75) leaves room above for the metrics.
+    ax_tbl = fig.add_axes([0.65, 0.35, 0.3, 0.4])
+    ax_tbl.axis("off")
+    tbl_data = [
+        [str(row["Type"]), f"{row['hours']:.2f}", f"{row['percent']:.1f}%"]
+        for _, row in agg.iterrows()
+    ]
+    col_labels = ["Type", "Hours", "%"]
+    table = ax_tbl.table(
+        cellText=tbl_data,
+        colLabels=col_labels,
+        cellLoc="left",
+        loc="upper left",
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+    table.auto_set_column_width(col=list(range(len(col_labels))))
+    return fig
+
+def _create_trend_figure(daily: pd.DataFrame) -> plt.Figure:
+    """Create the daily trend page of a range report: total hours per day.
+
+    :param daily: Hours per day (rows) and craft (columns) from
+        ``prepare_range_report``.
+    """
+    import matplotlib.pyplot as plt
+
+    totals = daily.sum(axis=1)
+    fig = plt.figure(figsize=(11, 8.5))
+    fig.suptitle("Daily Hours", fontsize=16, y=0.98)
+    ax = fig.add_axes([0.08, 0.2, 0.86, 0.68])
+    positions = np.arange(len(totals))
+    ax.bar(positions, totals.to_numpy(), color="#4C78A8", width=0.8, edgecolor="black", linewidth=0.5)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([pd.Timestamp(d).strftime("%m/%d") for d in totals.index], rotation=45, fontsize=8)
+    ax.set_xlabel("Production Date")
+    ax.set_ylabel("Hours")
+    ax.margins(x=0.02)
+    return fig
+
+# Descriptions and problems repeat heavily across days, crafts and the
+# overall pass, so wrapped cell text is memoized on (text, width).  Strings
+# that already fit on one line skip textwrap entirely.
+_WRAP_CACHE_SIZE = 16384
+_wrap_fast_path_count = 0
+
+@functools.lru_cache(maxsize=_WRAP_CACHE_SIZE)
+def _wrap_cached(text: str, width: int) -> str:
+    """Wrap ``text`` to ``width`` characters with the PDF table settings."""
+    return textwrap.fill(text, width=width, break_long_words=True, break_on_hyphens=True)
+
+def _wrap_cell_text(text: str, width: int = 50) -> str:
+    """Return ``text`` wrapped for a PDF table cell.
+
+    The result is identical to ``textwrap.fill`` with long words and hyphens
+    allowed to break.  Short single-line strings without trailing spaces are
+    already in wrapped form and are returned unchanged."""
+    global _wrap_fast_path_count
+    if len(text) <= width and text.isprintable() and not text.endswith(" "):
+        _wrap_fast_path_count += 1
+        return text
+    return _wrap_cached(text, width)
+
+def wrap_cache_stats() -> Dict[str, Any]:
+    """Return counters for the cell text wrapping cache.
+
+    ``hit_rate`` counts fast-path strings as hits since neither needs a call
+    into textwrap."""
+    info = _wrap_cached.cache_info()
+    calls = info.hits + info.misses + _wrap_fast_path_count
+    return {
+        "calls": calls,
+        "fast_path": _wrap_fast_path_count,
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": (calls - info.misses) / calls if calls else 0.0,
+    }
+
+def _work_order_shading(df: pd.DataFrame) -> np.ndarray:
+    """Return alternating shading flags for groups of identical Work Order #
+    values.  The first group is shaded and the flag toggles each time the
+    value changes.  Values are compared as strings so numeric and text work
+    order numbers group consistently."""
+    if "Work Order #" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    work_orders = df["Work Order #"].astype(str)
+    return (work_orders.ne(work_orders.shift()).cumsum() % 2 == 1).to_numpy()
+
+def plan_detail_pages(
+    df_wrapped: pd.DataFrame,
+    rows_per_page: int = 20,
+    header_lines: int = 1,
+    shade_by_work_order: bool = False,
+) -> Dict[str, Any]:
+    """
+    Work out row heights, work order shading and page breaks for a detail
+    table without drawing anything.
+
+    The number of lines in a row is the maximum of the line counts in the
+    wrapped Description and Problem columns (or 1 if both are empty).  Rows
+    are added to a page until the accumulated height, starting with the
+    header, would exceed the 0.85 of the page reserved for the table.  A
+    page always holds at least one row.
+
+    :param df_wrapped: Detail rows with Description and Problem already
+        wrapped into multiple lines.
+    :param rows_per_page: Nominal number of single-line rows per page, used
+        to derive the height of one line.
+    :param header_lines: Number of lines in the tallest header label.
+    :param shade_by_work_order: When True, compute alternating shading flags
+        that toggle each time the Work Order # changes.  The first group is
+        shaded.
+    :return: Dictionary with ``line_counts`` (int array per row), ``shading``
+        (bool array per row), ``pages`` (list of arrays of row positions),
+        ``base_height`` and ``header_height``.
+    """
+    n_rows = len(df_wrapped)
+    line_counts = np.ones(n_rows, dtype=np.int64)
+    for col in ["Description", "Problem"]:
+        if col in df_wrapped.columns:
+            col_lines = df_wrapped[col].astype(str).str.count("\n").to_numpy(dtype=np.int64) + 1
+            line_counts = np.maximum(line_counts, col_lines)
+
+    shading = np.zeros(n_rows, dtype=bool)
+    if shade_by_work_order:
+        shading = _work_order_shading(df_wrapped)
+
+    # Compute a base height per line.  We allocate 85% of the axis height to
+    # the table body and header combined.  If all rows were single-line and
+    # there were exactly rows_per_page rows, everything would fit.
+    base_height = 0.85 / (rows_per_page + 1)
+    header_height = base_height * header_lines
+    row_heights = base_height * line_counts
+
+    # Each page is found from a running sum over a window of the following
+    # rows.  Every row is at least one line tall, so a page can never hold
+    # more than ``window`` rows.  The running sum adds the heights in the same
+    # order as a row-by-row accumulation, so page breaks land on the same
+    # rows at the 0.85 boundary.
+    window = int(0.85 / base_height) + 2
+    pages: List[np.ndarray] = []
+    start = 0
+    while start < n_rows:
+        stop = min(start + window, n_rows)
+        heights = np.cumsum(np.concatenate(([header_height], row_heights[start:stop])))[1:]
+        overflow = np.flatnonzero(heights > 0.85)
+        size = max(int(overflow[0]), 1) if overflow.size else stop - start
+        pages.append(np.arange(start, start + size))
+        start += size
+    return {
+        "line_counts": line_counts,
+        "shading": shading,
+        "pages": pages,
+        "base_height": base_height,
+        "header_height": header_height,
+    }
+
+def _create_detail_table_figures(
+    df_detail: pd.DataFrame,
+    craft_name: str,
+    rows_per_page: int = 20,
+    shade_by_work_order: bool = False,
+) -> List[plt.Figure]:
+    """
+    Split a detailed DataFrame into multiple figures for inclusion in the PDF.
+
+    This function dynamically determines how many rows fit on a single page
+    based on the amount of text that appears in the Description and Problem
+    columns.  Rows that contain wrapped text consume more vertical space than
+    those with single-line text.  By calculating the height required for each
+    row and breaking pages only when the accumulated height exceeds the
+    available space, tables will never run off the bottom of the page.  In
+    addition, header labels are wrapped to fit within their columns and the
+    Type column is color coded with bold white text to match the dashboard.
+
+    :param df_detail: DataFrame with the detail rows to display.
+    :param craft_name: Name of the craft group.
+    :param rows_per_page: A nominal maximum number of rows per page.  This
+        value is used to determine a base row height.  Pages may contain
+        fewer rows if wrapping causes rows to require additional height.
+    :param shade_by_work_order: When True, apply alternating row shading based
+        on groups of identical Work Order # values.  Shading toggles between
+        shaded and unshaded each time the Work Order # changes in the sorted
+        data.  Only non-Type columns receive the shading; the Type column
+        retains its color-coded formatting.
+    :return: List of matplotlib Figures.
+    """
+    import matplotlib.pyplot as plt
+
+    col_widths = PDF_COLUMN_WIDTHS
+
+    figures: List[plt.Figure] = []
+    # Convert to a simple DataFrame for PDF output
+    df_pdf = _df_for_pdf(df_detail)
+    col_labels = df_pdf.columns.tolist()
+
+    # Wrap header labels to prevent truncation.  Insert manual line breaks for
+    # specific headers and use a small width for others so multi-word labels
+    # wrap naturally.
+    header_wrapped: List[str] = []
+    for lbl in col_labels:
+        if lbl == "Work Order #":
+            header_wrapped.append("Work Order\n#")
+        elif lbl == "Sum of Hours":
+            header_wrapped.append("Sum of\nHours")
+        else:
+            wrapped = textwrap.fill(
+                lbl,
+                width=10,
+                break_long_words=False,
+                break_on_hyphens=False,
+            )
+            header_wrapped.append(wrapped)
+
+    # Identify the index of the "Type" column so we can color it later.
+    try:
+        type_col_index = col_labels.index("Type")
+    except ValueError:
+        type_col_index = None
+
+    # Prepare wrapped DataFrame for both content and line counting.  Wrap
+    # Description and Problem columns using a narrower width to ensure
+    # long text breaks across multiple lines within the PDF column.  We use
+    # a width of 50 characters which has been empirically found to fit
+    # comfortably within the Problem column at a small font size.
+    df_wrapped = df_pdf.copy()
+    for col in ["Description", "Problem"]:
+        if col in df_wrapped.columns:
+            df_wrapped[col] = df_wrapped[col].astype(str).map(lambda x: _wrap_cell_text(x, 50))
+
+    # Determine header line count to set header row height.  The tallest
+    # header cell determines the number of lines.
+    header_line_counts = [lbl.count("\n") + 1 for lbl in header_wrapped]
+    header_lines = max(header_line_counts) if header_line_counts else 1
+
+    plan = plan_detail_pages(
+        df_wrapped,
+        rows_per_page=rows_per_page,
+        header_lines=header_lines,
+        shade_by_work_order=shade_by_work_order,
+    )
+    line_counts = plan["line_counts"]
+    shading_flags = plan["shading"]
+    base_height = plan["base_height"]
+    header_height = plan["header_height"]
+    pages = plan["pages"]
+
+    # Generate a figure for each page
+    for page_num, page_rows in enumerate(pages, start=1):
+        # Slice the wrapped DataFrame to only include rows on this page
+        chunk = df_wrapped.iloc[page_rows].copy()
+        # Create the figure and axis for this page.  Landscape orientation is
+        # used to match the rest of the report.  The title reflects the
+        # current page number and the total number of pages.
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.suptitle(
+            f"{craft_name} — Detail (Page {page_num}/{len(pages)})",
+            fontsize=14,
+            y=0.95,
+        )
+        ax = fig.add_axes([0.05, 0.05, 0.90, 0.85])
+        ax.axis("off")
+        # Build the table with fixed column widths.  Provide the wrapped
+        # headers and content.  All cells are left aligned.
+        table = ax.table(
+            cellText=chunk.values,
+            colLabels=header_wrapped,
+            cellLoc="left",
+            loc="upper left",
+            colWidths=col_widths,
+        )
+        table.auto_set_font_size(False)
+        table.set_fontsize(7)
+        # Set header row height based on header_lines
+        for col_idx in range(len(header_wrapped)):
+            table[(0, col_idx)].set_height(header_height)
+        # Set row heights and apply color formatting for the Type column
+        row_heights = base_height * line_counts[page_rows]
+        type_values = chunk["Type"].astype(str).tolist() if type_col_index is not None else []
+        for r_idx, row_idx in enumerate(page_rows):
+            row_height = row_heights[r_idx]
+            # Set height for each cell in the row
+            for col_idx in range(len(header_wrapped)):
+                table[(r_idx + 1, col_idx)].set_height(row_height)
+            # Apply color coding to Type column
+            if type_col_index is not None:
+                color = TYPE_COLORS.get(type_values[r_idx], "#FFFFFF")
+                cell = table[(r_idx + 1, type_col_index)]
+                cell.set_facecolor(color)
+                # Set text color and weight
+                text = cell.get_text()
+                text.set_color("white")
+                text.set_weight("bold")
+
+            # Apply alternating shading for non-Type cells if enabled
+            if shade_by_work_order:
+                if shading_flags[row_idx]:
+                    # Choose a very light blue for shading; skip Type column
+                    shade_color = "#eaf3ff"
+                    for col_idx in range(len(header_wrapped)):
+                        if type_col_index is not None and col_idx == type_col_index:
+                            continue
+                        cell = table[(r_idx + 1, col_idx)]
+                        # Only override facecolor if no color is already set
+                        # Use set_facecolor directly to apply shading
+                        cell.set_facecolor(shade_color)
+        figures.append(fig)
+    return figures
+
+def _write_front_pages(
+    pdf: PdfPages,
+    report: Dict[str, Any],
+    date_label: str,
+    sort_option: str,
+    max_type_count: int,
+) -> None:
+    """Write the title page and the overall summary page to ``pdf``."""
+    import matplotlib.pyplot as plt
+
+    # Title page
+    with span("pdf page", page="title"):
+        fig_title = plt.figure(figsize=(11, 8.5))
+        # Title page heading
+        fig_title.text(0.5, 0.6, "Daily MS Work Order Log", fontsize=24, ha="center")
+        fig_title.text(0.5, 0.5, f"Report for {date_label}", fontsize=16, ha="center")
+        plt.axis("off")
+        pdf.savefig(fig_title)
+        plt.close(fig_title)
+
+    # Overall summary page.  The sort order does not change the aggregated
+    # hours, so the summary reads the report's breakdown directly.  Do not
+    # include full-detail pages for the overall summary.  The detail tables
+    # will be presented under each craft section.
+    agg = _overall_breakdown(report)
+    if agg is not None:
+        with span("pdf page", page="Overall Summary"):
+            summary_fig = _create_summary_figure(agg, "Overall Summary", max_type_count)
+            pdf.savefig(summary_fig)
+            plt.close(summary_fig)
+    daily = report.get("daily")
+    if isinstance(daily, pd.DataFrame) and not daily.empty:
+        with span("pdf page", page="Daily Hours"):
+            trend_fig = _create_trend_figure(daily)
+            pdf.savefig(trend_fig)
+            plt.close(trend_fig)
+
+def _sort_detail_for_pdf(df_detail: pd.DataFrame, sort_option: str) -> pd.DataFrame:
+    """Sort detail rows according to the selected table sorting option."""
+    df_sorted = df_detail.copy()
+    if sort_option == "Work Order # (descending)":
+        try:
+            df_sorted["Work Order #"] = pd.to_numeric(df_sorted["Work Order #"], errors="coerce")
+            df_sorted = df_sorted.sort_values(by="Work Order #", ascending=False)
+        except Exception:
+            # Fallback to string sorting if numeric conversion fails
+            df_sorted = df_sorted.sort_values(by="Work Order #", ascending=False)
+    else:
+        try:
+            df_sorted = df_sorted.sort_values(by="Name")
+        except Exception:
+            pass
+    return df_sorted
+
+def _write_craft_pages(
+    pdf: PdfPages,
+    craft_name: str,
+    df_sorted: pd.DataFrame | None,
+    agg: pd.DataFrame,
+    max_type_count: int,
+    shade_by_work_order: bool,
+) -> None:
+    """Write the summary page and detail table pages for one craft to ``pdf``.
+
+    Range reports have no detail rows (``df_sorted`` is None) and only get
+    the summary page."""
+    import matplotlib.pyplot as plt
+
+    # Summary page for this craft with fixed bar width
+    with span("pdf page", craft=craft_name, page="summary"):
+        craft_summary_fig = _create_summary_figure(agg, craft_name, max_type_count)
+        pdf.savefig(craft_summary_fig)
+        plt.close(craft_summary_fig)
+    if df_sorted is None:
+        return
+    # Detail table pages for this craft
+    with span("pdf detail layout", craft=craft_name):
+        craft_detail_figs = _create_detail_table_figures(
+            df_sorted,
+            craft_name,
+            shade_by_work_order=shade_by_work_order,
+        )
+    for page, fig in enumerate(craft_detail_figs, start=1):
+        with span("pdf page", craft=craft_name, page=f"detail {page}"):
+            pdf.savefig(fig)
+            plt.close(fig)
+
+# -----------------------------------------------------------------------------
+# Parallel PDF rendering
+#
+# Each craft's pages do not depend on any other craft, so they can be rendered
+# in separate worker processes.  Every worker writes its craft to a small PDF
+# of its own and the parent merges the parts in report (CRAFT_ORDER) order with
+# pypdf.  Any failure to start or run the pool returns None so ``build_pdf``
+# falls back to rendering serially.
+def _init_render_worker() -> None:
+    """Select the non-interactive Agg backend in a PDF worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+def _render_craft_pdf(
+    craft_name: str,
+    df_sorted: pd.DataFrame | None,
+    agg: pd.DataFrame,
+    max_type_count: int,
+    shade_by_work_order: bool,
+) -> bytes:
+    """Render one craft's pages to a standalone PDF and return its bytes."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        _write_craft_pages(pdf, craft_name, df_sorted, agg, max_type_count, shade_by_work_order)
+    return buffer.getvalue()
+
+def _build_pdf_parallel(
+    report: Dict[str, Any],
+    date_label: str,
+    sort_option: str,
+    crafts: List[tuple[str, pd.DataFrame | None, pd.DataFrame]],
+    max_type_count: int,
+    shade_by_work_order: bool,
+    workers: int,
+) -> bytes | None:
+    """Render the craft sections in a process pool and merge the parts.
+
+    Returns None when pypdf is unavailable or the pool cannot be used; pool
+    failures are logged."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        return None
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+            futures = [
+                pool.submit(_render_craft_pdf, craft_name, df_sorted, agg, max_type_count, shade_by_work_order)
+                for craft_name, df_sorted, agg in crafts
+            ]
+            # Render the title and overall summary while the workers run.
+            front = io.BytesIO()
+            with PdfPages(front) as pdf:
+                _write_front_pages(pdf, report, date_label, sort_option, max_type_count)
+            parts = [front.getvalue()] + [future.result() for future in futures]
+    except Exception:
+        logger.warning("Parallel PDF rendering failed; rendering serially instead.", exc_info=True)
+        return None
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(io.BytesIO(part))
+    # Each part embeds its own copy of the fonts; keep one of each.
+    writer.compress_identical_objects()
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+# -----------------------------------------------------------------------------
+# ReportLab PDF backend
+#
+# Drawing the detail tables with matplotlib creates and adjusts every cell as
+# an artist, which is slow for large crafts and produces heavy files.  The
+# ReportLab backend writes the same pages with platypus flowables instead:
+# tables paginate themselves with a repeated header row, Description and
+# Problem wrap natively inside their columns, and the Type colors and work
+# order shading are applied as table style commands over runs of rows.
+PDF_BACKENDS: List[str] = ["matplotlib", "reportlab"]
+
+def _value_runs(values: np.ndarray) -> List[tuple[int, int, Any]]:
+    """Return (first, last, value) for each run of equal consecutive values."""
+    if len(values) == 0:
+        return []
+    breaks = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(values)])) - 1
+    return [(int(first), int(last), values[first]) for first, last in zip(starts, ends)]
+
+def _rl_summary_flowables(agg: pd.DataFrame, craft_name: str, max_type_count: int, styles) -> List[Any]:
+    """Build the summary page for one craft from its hours-by-type breakdown:
+    a bar chart next to the key metrics and the breakdown table."""
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.lib import colors
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+    total = float(agg["hours"].sum())
+    top_type = agg.iloc[0]["Type"] if not agg.empty else "-"
+    top_pct = agg.iloc[0]["percent"] if not agg.empty else 0.0
+    type_labels = agg["Type"].astype(str).tolist()
+
+    # Pad the categories up to ``max_type_count`` so bars keep the same width
+    # across crafts, matching the fixed x-axis of the matplotlib summary.
+    n_slots = max(int(max_type_count), len(type_labels), 1)
+    drawing = Drawing(400, 300)
+    drawing.add(String(200, 285, "Hours by Work Order Type", fontName="Helvetica", fontSize=12, textAnchor="middle"))
+    chart = VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = 50, 80, 330, 190
+    chart.data = [agg["hours"].astype(float).tolist() + [0.0] * (n_slots - len(type_labels))]
+    chart.categoryAxis.categoryNames = type_labels + [""] * (n_slots - len(type_labels))
+    chart.categoryAxis.labels.angle = 45
+    chart.categoryAxis.labels.boxAnchor = "ne"
+    chart.categoryAxis.labels.fontName = "Helvetica"
+    chart.categoryAxis.labels.fontSize = 6
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = "Helvetica"
+    chart.valueAxis.labels.fontSize = 7
+    chart.barSpacing = 2
+    chart.bars.strokeColor = colors.black
+    chart.bars.strokeWidth = 0.5
+    for i, t in enumerate(agg["Type"]):
+        color = TYPE_COLORS.get(t, "#333333") if isinstance(t, str) else "#333333"
+        chart.bars[(0, i)].fillColor = colors.HexColor(color)
+    drawing.add(chart)
+
+    breakdown = Table(
+        [["Type", "Hours", "%"]]
+        + [[str(row["Type"]), f"{row['hours']:.2f}", f"{row['percent']:.1f}%"] for _, row in agg.iterrows()],
+        hAlign="LEFT",
+    )
+    breakdown.setStyle(
+        TableStyle(
+            [
+                ("FONT", (0, 0), (-1, -1), "Helvetica", 8),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+    )
+    metrics = [
+        Paragraph(f"Total Hours: {total:,.2f}", styles["Normal"]),
+        Paragraph(f"Top Type: {_xml_escape(str(top_type))}", styles["Normal"]),
+        Paragraph(f"% in Top Type: {top_pct:.1f}%", styles["Normal"]),
+        Spacer(1, 12),
+        breakdown,
+    ]
+    layout = Table([[drawing, metrics]], colWidths=[430, 290])
+    layout.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
+    return [Paragraph(_xml_escape(f"{craft_name} — Summary"), styles["Title"]), layout]
+
+def _rl_trend_flowables(daily: pd.DataFrame, styles) -> List[Any]:
+    """Build the daily trend page of a range report: total hours per day."""
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+    from reportlab.platypus import Paragraph
+
+    totals = daily.sum(axis=1)
+    drawing = Drawing(720, 400)
+    chart = VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = 50, 60, 650, 320
+    chart.data = [totals.astype(float).tolist()]
+    chart.categoryAxis.categoryNames = [pd.Timestamp(d).strftime("%m/%d") for d in totals.index]
+    chart.categoryAxis.labels.angle = 45
+    chart.categoryAxis.labels.boxAnchor = "ne"
+    chart.categoryAxis.labels.fontName = "Helvetica"
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = "Helvetica"
+    chart.valueAxis.labels.fontSize = 7
+    chart.bars.strokeColor = colors.black
+    chart.bars.strokeWidth = 0.5
+    chart.bars[0].fillColor = colors.HexColor("#4C78A8")
+    drawing.add(chart)
+    return [Paragraph("Daily Hours", styles["Title"]), drawing]
+
+def _rl_detail_table(df_detail: pd.DataFrame, shade_by_work_order: bool, width: float, styles):
+    """Build the detail table for one craft as a single self-paginating table."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import Paragraph, Table, TableStyle
+
+    df_pdf = _df_for_pdf(df_detail)
+    col_labels = df_pdf.columns.tolist()
+    cell_style = ParagraphStyle("cell", parent=styles["Normal"], fontName="Helvetica", fontSize=7, leading=8.5)
+    header = [Paragraph(_xml_escape(lbl), cell_style) for lbl in col_labels]
+    wrap_cols = {col_labels.index(c) for c in ("Description", "Problem") if c in col_labels}
+    body: List[List[Any]] = []
+    for values in df_pdf.astype(str).itertuples(index=False, name=None):
+        body.append(
+            [Paragraph(_xml_escape(v), cell_style) if i in wrap_cols else v for i, v in enumerate(values)]
+        )
+    col_widths = [w * width for w in PDF_COLUMN_WIDTHS[: len(col_labels)]]
+    table = Table([header] + body, colWidths=col_widths, repeatRows=1)
+
+    commands: List[tuple] = [
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 7),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.black),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+    type_col = col_labels.index("Type") if "Type" in col_labels else None
+    if shade_by_work_order:
+        shade = colors.HexColor("#eaf3ff")
+        # Shade every column except Type so its color coding remains.
+        if type_col is None:
+            spans = [(0, len(col_labels) - 1)]
+        else:
+            spans = [(0, type_col - 1), (type_col + 1, len(col_labels) - 1)]
+        spans = [(c0, c1) for c0, c1 in spans if c0 <= c1]
+        for first, last, flag in _value_runs(_work_order_shading(df_pdf)):
+            if flag:
+                for c0, c1 in spans:
+                    commands.append(("BACKGROUND", (c0, first + 1), (c1, last + 1), shade))
+    if type_col is not None:
+        for first, last, value in _value_runs(df_pdf["Type"].astype(str).to_numpy()):
+            color = TYPE_COLORS.get(value)
+            if color is None:
+                continue
+            cells = ((type_col, first + 1), (type_col, last + 1))
+            commands.append(("BACKGROUND", *cells, colors.HexColor(color)))
+            commands.append(("TEXTCOLOR", *cells, colors.white))
+            commands.append(("FONTNAME", *cells, "Helvetica-Bold"))
+    table.setStyle(TableStyle(commands))
+    return table
+
+def _build_pdf_reportlab(
+    report: Dict[str, Any],
+    date_label: str,
+    sort_option: str,
+    crafts: List[tuple[str, pd.DataFrame | None, pd.DataFrame]],
+    max_type_count: int,
+    shade_by_work_order: bool,
+) -> bytes:
+    """Write the title, summary and detail pages with ReportLab platypus."""
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    buffer = io.BytesIO()
+    margin = 36
+    page_width, page_height = landscape(letter)
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=(page_width, page_height),
+        leftMargin=margin,
+        rightMargin=margin,
+        topMargin=margin,
+        bottomMargin=margin,
+        title=f"Daily MS Work Order Log {date_label}",
+    )
+
+    # Platypus lays out and draws the whole story in one call, so pages are
+    # timed between the page-begin callbacks.
+    timings = active_timings()
+    page_started = [time.perf_counter()]
+
+    def _page_number(canvas, doc_) -> None:
+        if timings is not None and doc_.page > 1:
+            now = time.perf_counter()
+            timings.record("pdf page", (now - page_started[0]) * 1000.0, page=doc_.page - 1)
+            page_started[0] = now
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(page_width - margin, margin / 2, f"Page {doc_.page}")
+
+    story: List[Any] = [
+        Spacer(1, page_height * 0.3),
+        Paragraph("Daily MS Work Order Log", styles["Title"].clone("cover", fontSize=24, leading=30)),
+        Paragraph(_xml_escape(f"Report for {date_label}"), styles["Title"].clone("cover_sub", fontSize=16, leading=20)),
+        PageBreak(),
+    ]
+    agg = _overall_breakdown(report)
+    if agg is not None:
+        story += _rl_summary_flowables(agg, "Overall Summary", max_type_count, styles)
+        story.append(PageBreak())
+    daily = report.get("daily")
+    if isinstance(daily, pd.DataFrame) and not daily.empty:
+        story += _rl_trend_flowables(daily, styles)
+        story.append(PageBreak())
+    for craft_name, df_sorted, agg in crafts:
+        story += _rl_summary_flowables(agg, craft_name, max_type_count, styles)
+        story.append(PageBreak())
+        if df_sorted is None:
+            continue
+        story.append(Paragraph(_xml_escape(f"{craft_name} — Detail"), styles["Heading2"]))
+        story.append(_rl_detail_table(df_sorted, shade_by_work_order, page_width - 2 * margin, styles))
+        story.append(PageBreak())
+    doc.build(story, onFirstPage=_page_number, onLaterPages=_page_number)
+    if timings is not None:
+        timings.record("pdf page", (time.perf_counter() - page_started[0]) * 1000.0, page=doc.page)
+    return buffer.getvalue()
+
+def build_pdf(
+    report: Dict[str, Any],
+    date_label: str,
+    sort_option: str = "Name",
+    shade_by_work_order: bool | None = None,
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> bytes:
+    """
+    Construct a PDF report with summary charts for each craft group along with
+    overall statistics.  This implementation uses matplotlib to render bar charts
+    and writes each figure to a multipage PDF via PdfPages.  A title page and an
+    optional overall summary page are included before the per-craft pages.
+
+    :param report: The dictionary produced by ``prepare_report_data`` with keys
+        ``groups`` (list of (craft_name, payload) tuples) and
+        ``full_detail`` (DataFrame containing all records), or by
+        ``prepare_range_report``, which gets summary pages and a daily trend
+        page but no detail tables.
+    :param date_label: The selected date (or date range) string used in the
+        report title and output file name.
+    :param workers: Number of worker processes used to render the craft
+        sections.  With more than one worker each craft is rendered in its own
+        process and the parts are merged in order; the serial path is used when
+        that is not possible.  The merged file is somewhat larger, as each part
+        embeds its own font subsets.  Only used by the matplotlib backend.
+    :param backend: One of ``PDF_BACKENDS``.  ``"matplotlib"`` renders every
+        page as a figure; ``"reportlab"`` writes the same layout with native
+        ReportLab tables, which is faster and gives smaller files.
+    :return: Bytes representing the PDF document.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; expected one of {PDF_BACKENDS}.")
+    buffer = io.BytesIO()
+    crafts: List[tuple[str, pd.DataFrame | None, pd.DataFrame]] = []
+    for craft_name, payload in report.get("groups", []):
+        df_detail = payload.get("detail")
+        if isinstance(df_detail, pd.DataFrame) and not df_detail.empty:
+            agg = _summary_breakdown(df_detail, payload.get("hours_by_type"))
+            crafts.append((craft_name, _sort_detail_for_pdf(df_detail, sort_option), agg))
+        elif df_detail is None and not payload.get("hours_by_type", pd.DataFrame()).empty:
+            # Range reports carry only the summary breakdown.
+            crafts.append((craft_name, None, payload["hours_by_type"]))
+    # Determine the maximum number of unique work order types across all groups.  This
+    # value is used to fix the x-axis width of bar charts so that bar width
+    # remains consistent across groups even when some groups contain fewer
+    # categories.  We gather all unique 'Type' values from the breakdowns of
+    # the crafts in the report and count them.  If no types are found, fall
+    # back to the number of keys in ``TYPE_COLORS``.
+    all_types: set[str] = set()
+    for _, _, agg in crafts:
+        all_types.update(agg["Type"].dropna().astype(str).unique().tolist())
+    if not all_types:
+        all_types = set(TYPE_COLORS.keys())
+    max_type_count = len(all_types)
+    # Determine whether to shade rows by work order based on sort_option if
+    # shade_by_work_order is not explicitly provided.  Explicitly passing
+    # shade_by_work_order overrides this inference.
+    if shade_by_work_order is None:
+        shade_by_work_order = sort_option == "Work Order # (descending)"
+
+    if backend == "reportlab":
+        return _build_pdf_reportlab(report, date_label, sort_option, crafts, max_type_count, shade_by_work_order)
+
+    if workers > 1 and len(crafts) > 1:
+        pdf_bytes = _build_pdf_parallel(
+            report,
+            date_label,
+            sort_option,
+            crafts,
+            max_type_count,
+            shade_by_work_order,
+            min(workers, len(crafts)),
+        )
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with PdfPages(buffer) as pdf:
+        _write_front_pages(pdf, report, date_label, sort_option, max_type_count)
+        # Per-craft pages
+        for craft_name, df_sorted, agg in crafts:
+            _write_craft_pages(pdf, craft_name, df_sorted, agg, max_type_count, shade_by_work_order)
+    buffer.seek(0)
+    return buffer.read()
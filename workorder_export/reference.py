@@ -0,0 +1,210 @@
+"""Reference data loaded from an external file and reloaded when it changes.
+
+The address book, craft order and work order type mappings ship hard-coded in
+``mappings``.  A deployment can instead keep them in a local file so a
+personnel change does not need a code change:
+
+- JSON: an object with any of the keys ``address_book`` (a list of objects
+  with ``AddressBookNumber``, ``Name`` and ``Craft Description``),
+  ``craft_order`` (a list of crafts), ``type_map`` (code to name) and
+  ``type_colors`` (type name to color).
+- CSV: the address book only, with the three address book columns.
+- SQLite (``.db``, ``.sqlite`` or ``.sqlite3``): any of the tables
+  ``address_book`` (the three address book columns), ``craft_order``
+  (``"Craft Description"``, in ``rowid`` order), ``type_map`` (``code``,
+  ``name``) and ``type_colors`` (``type``, ``color``).
+
+Tables the file does not provide keep their built-in values.  The file's
+tables are copied into the ``mappings`` objects in place, so every module that
+imported them sees the new values.  ``ReferenceWatcher`` polls the file's
+modification time and size, and only reloads when its content hash changes.
+"""
+import copy
+import csv
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from . import mappings
+from .data import _reset_reference_caches
+
+TABLES: List[str] = ["address_book", "craft_order", "type_map", "type_colors"]
+
+_ADDRESS_BOOK_COLUMNS = ["AddressBookNumber", "Name", "Craft Description"]
+_SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+# The built-in tables, restored when the file stops providing one.
+_DEFAULTS: Dict[str, Any] = {
+    "address_book": copy.deepcopy(mappings.ADDRESS_BOOK),
+    "craft_order": list(mappings.CRAFT_ORDER),
+    "type_map": dict(mappings.TYPE_MAP),
+    "type_colors": dict(mappings.TYPE_COLORS),
+}
+
+def default_reference_path() -> Path | None:
+    """Return the reference data file named by ``WORKORDER_EXPORT_REFERENCE``, if set."""
+    env = os.environ.get("WORKORDER_EXPORT_REFERENCE")
+    return Path(env) if env else None
+
+def _current_tables() -> Dict[str, Any]:
+    """Return the live ``mappings`` objects keyed by table name."""
+    return {
+        "address_book": mappings.ADDRESS_BOOK,
+        "craft_order": mappings.CRAFT_ORDER,
+        "type_map": mappings.TYPE_MAP,
+        "type_colors": mappings.TYPE_COLORS,
+    }
+
+def _address_book_rows(rows) -> List[Dict[str, str]]:
+    """Return address book entries with the three columns as stripped strings."""
+    book = []
+    for row in rows:
+        missing = [c for c in _ADDRESS_BOOK_COLUMNS if c not in row]
+        if missing:
+            raise ValueError(f"Address book entry is missing {missing}: {dict(row)}")
+        book.append({c: str(row[c] if row[c] is not None else "").strip() for c in _ADDRESS_BOOK_COLUMNS})
+    return book
+
+def _parse_json(data: bytes) -> Dict[str, Any]:
+    raw = json.loads(data.decode("utf-8-sig"))
+    if not isinstance(raw, dict):
+        raise ValueError("Reference JSON must be an object keyed by table name.")
+    tables: Dict[str, Any] = {}
+    if "address_book" in raw:
+        tables["address_book"] = _address_book_rows(raw["address_book"])
+    if "craft_order" in raw:
+        tables["craft_order"] = [str(c).strip() for c in raw["craft_order"]]
+    if "type_map" in raw:
+        tables["type_map"] = {str(k).strip(): str(v) for k, v in raw["type_map"].items()}
+    if "type_colors" in raw:
+        tables["type_colors"] = {str(k): str(v) for k, v in raw["type_colors"].items()}
+    return tables
+
+def _parse_csv(data: bytes) -> Dict[str, Any]:
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+    return {"address_book": _address_book_rows(reader)}
+
+def _parse_sqlite(path: str) -> Dict[str, Any]:
+    tables: Dict[str, Any] = {}
+    # Read-only, so a file being edited by another tool is never written to.
+    con = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        con.row_factory = sqlite3.Row
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+        if "address_book" in names:
+            tables["address_book"] = _address_book_rows(
+                dict(r) for r in con.execute('SELECT AddressBookNumber, Name, "Craft Description" FROM address_book')
+            )
+        if "craft_order" in names:
+            crafts = con.execute('SELECT "Craft Description" FROM craft_order ORDER BY rowid')
+            tables["craft_order"] = [str(r[0]).strip() for r in crafts]
+        if "type_map" in names:
+            tables["type_map"] = {str(r[0]).strip(): str(r[1]) for r in con.execute("SELECT code, name FROM type_map")}
+        if "type_colors" in names:
+            tables["type_colors"] = {str(r[0]): str(r[1]) for r in con.execute("SELECT type, color FROM type_colors")}
+    finally:
+        con.close()
+    return tables
+
+def load_reference_data(path: str | os.PathLike) -> Dict[str, Any]:
+    """Read the reference tables provided by the file at ``path``.
+
+    :return: A dictionary with the tables found in the file, keyed by the
+        names in ``TABLES``.
+    :raises ValueError: If the file cannot be parsed.
+    """
+    suffix = Path(path).suffix.lower()
+    try:
+        if suffix in _SQLITE_SUFFIXES:
+            return _parse_sqlite(str(path))
+        with open(path, "rb") as f:
+            data = f.read()
+        if suffix == ".csv":
+            return _parse_csv(data)
+        return _parse_json(data)
+    except (OSError, csv.Error, sqlite3.Error, UnicodeDecodeError, json.JSONDecodeError, AttributeError, TypeError) as e:
+        raise ValueError(f"Could not read reference data from {path}: {e}") from e
+
+def apply_reference_data(tables: Dict[str, Any]) -> List[str]:
+    """Install ``tables`` as the current reference data.
+
+    Tables missing from ``tables`` go back to their built-in values.  Caches
+    derived from the tables are cleared when anything changed.
+
+    :return: The names of the tables whose contents changed.
+    """
+    current = _current_tables()
+    changed = []
+    for name in TABLES:
+        value = tables.get(name, _DEFAULTS[name])
+        target = current[name]
+        if value == target:
+            continue
+        if isinstance(target, list):
+            target[:] = copy.deepcopy(value)
+        else:
+            target.clear()
+            target.update(value)
+        changed.append(name)
+    if changed:
+        _reset_reference_caches()
+    return changed
+
+def reference_digests() -> Dict[str, str]:
+    """Return a digest of each current reference table.
+
+    Caches of results that depend on a table can key on its digest, so they
+    are invalidated when, and only when, that table changes."""
+    return {
+        name: hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+        for name, value in _current_tables().items()
+    }
+
+class ReferenceWatcher:
+    """Reloads the reference data from ``path`` when the file changes.
+
+    ``check`` is cheap enough to call on every Streamlit rerun: it only
+    stats the file, and hashes it when the modification time or size
+    changed.  A file that cannot be read leaves the current tables in place
+    and sets ``error``.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.error: str | None = None
+        self._stat: tuple | None = None
+        self._hash: str | None = None
+        self._lock = threading.Lock()
+
+    def check(self) -> List[str]:
+        """Reload the file if it changed.
+
+        :return: The names of the tables whose contents changed.
+        """
+        with self._lock:
+            try:
+                st = self.path.stat()
+            except OSError as e:
+                self.error = f"Reference data file not found: {e}"
+                return []
+            stat = (st.st_mtime_ns, st.st_size)
+            if stat == self._stat:
+                return []
+            self._stat = stat
+            try:
+                with open(self.path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                if digest == self._hash:
+                    return []
+                tables = load_reference_data(self.path)
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                return []
+            self._hash = digest
+            self.error = None
+            return apply_reference_data(tables)
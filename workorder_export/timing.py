@@ -0,0 +1,106 @@
+"""Timing spans for the report pipeline.
+
+Stages of the pipeline are wrapped in ``span("name")``.  Spans only record
+anything while a ``Timings`` collector is active in the current thread (the
+Streamlit app opens one per rerun), so library callers and PDF worker
+processes pay nothing for them.  A collector can also capture the peak
+traced memory with ``tracemalloc``.
+"""
+import contextvars
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+_active: contextvars.ContextVar["Timings | None"] = contextvars.ContextVar("workorder_export_timings", default=None)
+
+class Timings:
+    """Collects the spans recorded while it is active.
+
+    Use it as a context manager around one run of the pipeline::
+
+        with Timings(trace_memory=True) as timings:
+            ...
+        print(timings.to_json())
+
+    :param trace_memory: Capture the peak memory allocated while active with
+        ``tracemalloc``.  Tracing is process-wide and slows allocation-heavy
+        code noticeably, so it is off by default.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self.total_ms = 0.0
+        self.peak_bytes: int | None = None
+        self._depth = 0
+        self._started_tracing = False
+
+    def __enter__(self) -> "Timings":
+        self._token = _active.set(self)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.total_ms = (time.perf_counter() - self._start) * 1000.0
+        if self.trace_memory:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+        _active.reset(self._token)
+
+    def record(self, name: str, ms: float, **fields: Any) -> None:
+        """Add a span measured elsewhere (for example per ReportLab page)."""
+        self.spans.append({"name": name, "ms": round(ms, 3), "depth": self._depth, **fields})
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        """Return the count and total milliseconds of the spans for each stage
+        name, in the order each stage first ran."""
+        stages: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            stage = stages.setdefault(s["name"], {"count": 0, "ms": 0.0})
+            stage["count"] += 1
+            stage["ms"] = round(stage["ms"] + s["ms"], 3)
+        return stages
+
+    def to_json(self, **fields: Any) -> str:
+        """Return one JSON line describing the run, with ``fields`` added."""
+        record = {
+            "event": "workorder_export.timings",
+            "ts": time.time(),
+            "total_ms": round(self.total_ms, 3),
+            "peak_bytes": self.peak_bytes,
+            "stages": self.stages(),
+            **fields,
+        }
+        return json.dumps(record, default=str)
+
+def active_timings() -> Timings | None:
+    """Return the collector active in this thread, if any."""
+    return _active.get()
+
+@contextmanager
+def span(name: str, **fields: Any) -> Iterator[None]:
+    """Time the enclosed block as stage ``name`` in the active collector.
+
+    Extra ``fields`` (for example the craft of a PDF page) are stored with
+    the span.  Without an active collector this does nothing."""
+    timings = _active.get()
+    if timings is None:
+        yield
+        return
+    index = len(timings.spans)
+    timings.record(name, 0.0, **fields)
+    timings._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._depth -= 1
+        timings.spans[index]["ms"] = round((time.perf_counter() - start) * 1000.0, 3)